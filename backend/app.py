@@ -4,23 +4,33 @@ import logging
 import time
 
 from dotenv import load_dotenv
-from flask import Flask, jsonify, g
+from flask import Flask, jsonify
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
-from sqlalchemy.exc import OperationalError
-from sqlalchemy import text
+from flask_jwt_extended import JWTManager, create_access_token
+from sqlalchemy.exc import DBAPIError, IntegrityError, OperationalError
+from sqlalchemy import inspect, text
 
 from src.models import Base
 from src.routes.auth_routes import auth_bp
 from src.routes.election_routes import election_bp
+from src.routes.tx_routes import tx_bp
 from src.routes.vote_routes import vote_bp
-from src.utils.db import get_engine, get_session, init_engine, remove_session
+from src.services.blockchain_service import (
+    BlockchainUnavailable,
+    compile_contract,
+    get_default_service,
+)
+from src.services.tally_service import backfill_tallies
+from src.utils.db import get_engine, init_engine, remove_session, session_scope
+from src.utils.json_provider import OrjsonProvider
+from src.utils.jwt_cache import CachedJWTManager
 
 
 def create_app() -> Flask:
     """Application factory used by Flask CLI and tests."""
     load_dotenv()
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
 
     app.config["SECRET_KEY"] = os.getenv("SECRET_KEY", "change-me")
     app.config["JWT_SECRET_KEY"] = app.config["SECRET_KEY"]
@@ -29,18 +39,23 @@ def create_app() -> Flask:
     database_uri = os.getenv("DATABASE_URI")
     if not database_uri:
         raise RuntimeError("DATABASE_URI environment variable is required")
-    init_engine(database_uri)
+    init_engine(
+        database_uri,
+        pool_size=int(os.getenv("DB_POOL_SIZE", "20")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        pool_timeout=int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        replica_uri=os.getenv("DATABASE_REPLICA_URI"),
+    )
     wait_for_database()
     Base.metadata.create_all(bind=get_engine())
+    ensure_indexes()
+    backfill_vote_tallies()
 
     CORS(app, resources={r"/api/*": {"origins": "*"}})
-    jwt = JWTManager(app)
+    jwt = CachedJWTManager(app)
     register_jwt_callbacks(jwt)
 
-    @app.before_request
-    def create_session():
-        g.db = get_session()
-
     @app.teardown_appcontext
     def close_session(exception=None):
         remove_session()
@@ -51,6 +66,8 @@ def create_app() -> Flask:
 
     register_blueprints(app)
     configure_logging()
+    init_blockchain(app)
+    warm_up(app)
 
     return app
 
@@ -59,6 +76,29 @@ def register_blueprints(app: Flask) -> None:
     app.register_blueprint(auth_bp, url_prefix="/api/v1/auth")
     app.register_blueprint(election_bp, url_prefix="/api/v1/elections")
     app.register_blueprint(vote_bp, url_prefix="/api/v1")
+    app.register_blueprint(tx_bp, url_prefix="/api/v1/tx")
+
+
+def init_blockchain(app: Flask) -> None:
+    """Build the shared BlockchainService once and expose it via app.extensions."""
+    try:
+        app.extensions["blockchain"] = get_default_service()
+    except BlockchainUnavailable:
+        app.extensions["blockchain"] = None
+    except Exception as exc:
+        # RPC fora do ar no boot: os servicos tentam novamente sob demanda.
+        logging.warning("Servico de blockchain indisponivel na inicializacao: %s", exc)
+
+
+def warm_up(app: Flask) -> None:
+    """Pay one-time setup costs at boot instead of on the first request."""
+    try:
+        compile_contract()
+    except Exception as exc:
+        logging.warning("Pre-carregamento do contrato ignorado: %s", exc)
+
+    with app.app_context():
+        create_access_token(identity="warmup")
 
 
 def configure_logging() -> None:
@@ -86,7 +126,33 @@ def register_jwt_callbacks(jwt: JWTManager) -> None:
         return jsonify({"message": "Token expirado"}), 401
 
 
-def wait_for_database(max_attempts: int = 10, interval_seconds: int = 2) -> None:
+def ensure_indexes() -> None:
+    """Create indexes added after the tables already existed (create_all skips them)."""
+    engine = get_engine()
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            try:
+                index.create(bind=engine, checkfirst=True)
+            except DBAPIError:
+                # Workers do gunicorn sobem em paralelo: outro pode ter criado o
+                # indice entre o checkfirst e o CREATE INDEX.
+                existing = {item["name"] for item in inspect(engine).get_indexes(table.name)}
+                if index.name not in existing:
+                    raise
+
+
+def backfill_vote_tallies() -> None:
+    try:
+        with session_scope() as session:
+            backfill_tallies(session)
+    except IntegrityError:
+        # Outro worker inseriu os mesmos contadores ao mesmo tempo.
+        logging.info("Contadores de votos ja preenchidos por outro worker")
+
+
+def wait_for_database(
+    max_attempts: int = 15, base_delay: float = 0.1, max_delay: float = 2.0
+) -> None:
     engine = get_engine()
     for attempt in range(1, max_attempts + 1):
         try:
@@ -100,7 +166,9 @@ def wait_for_database(max_attempts: int = 10, interval_seconds: int = 2) -> None
                 max_attempts,
                 exc,
             )
-            time.sleep(interval_seconds)
+            # Descarta conexoes possivelmente quebradas antes da proxima tentativa.
+            engine.dispose()
+            time.sleep(min(max_delay, base_delay * (2 ** (attempt - 1))))
     raise RuntimeError("Banco de dados nao respondeu dentro do tempo limite.")
 
 
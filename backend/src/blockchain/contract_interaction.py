@@ -5,20 +5,22 @@ from dotenv import load_dotenv
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 
-from src.services.blockchain_service import compile_contract
+from src.services.blockchain_service import (
+    build_http_provider,
+    fetch_nonce_and_gas_price,
+    load_contract,
+)
 
 
 def get_contract(web3: Web3, address: str):
-    contract_interface = compile_contract()
-    abi = contract_interface["abi"]
-    return web3.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+    return load_contract(web3, address)
 
 
 def connect_web3() -> Web3:
     rpc_url = os.getenv("RPC_URL")
     if not rpc_url:
         raise SystemExit("RPC_URL must be defined in the environment.")
-    web3 = Web3(Web3.HTTPProvider(rpc_url))
+    web3 = Web3(build_http_provider(rpc_url))
     web3.middleware_onion.inject(geth_poa_middleware, layer=0)
     return web3
 
@@ -29,12 +31,12 @@ def cast_vote(contract, election_id: int, candidate_index: int):
     if not private_key or not account_address:
         raise SystemExit("PRIVATE_KEY and ACCOUNT_ADDRESS must be configured.")
 
-    nonce = contract.web3.eth.get_transaction_count(account_address)
+    nonce, gas_price = fetch_nonce_and_gas_price(contract.web3, account_address)
     transaction = contract.functions.vote(election_id, candidate_index).build_transaction(
         {
             "from": account_address,
             "nonce": nonce,
-            "gasPrice": contract.web3.eth.gas_price,
+            "gasPrice": gas_price,
         }
     )
     transaction["gas"] = transaction.get("gas", 500_000)
@@ -58,12 +60,12 @@ def create_election(contract, title: str, candidates):
     if not private_key or not account_address:
         raise SystemExit("PRIVATE_KEY and ACCOUNT_ADDRESS must be configured.")
 
-    nonce = contract.web3.eth.get_transaction_count(account_address)
+    nonce, gas_price = fetch_nonce_and_gas_price(contract.web3, account_address)
     transaction = contract.functions.createElection(title, candidates).build_transaction(
         {
             "from": account_address,
             "nonce": nonce,
-            "gasPrice": contract.web3.eth.gas_price,
+            "gasPrice": gas_price,
         }
     )
     transaction["gas"] = transaction.get("gas", 3_000_000)
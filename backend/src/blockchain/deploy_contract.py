@@ -4,7 +4,7 @@ from dotenv import load_dotenv
 from web3 import Web3
 from web3.middleware import geth_poa_middleware
 
-from src.services.blockchain_service import compile_contract
+from src.services.blockchain_service import build_http_provider, compile_contract
 
 
 def main():
@@ -16,7 +16,7 @@ def main():
     if not rpc_url or not private_key or not account_address:
         raise SystemExit("RPC_URL, PRIVATE_KEY and ACCOUNT_ADDRESS must be configured.")
 
-    web3 = Web3(Web3.HTTPProvider(rpc_url))
+    web3 = Web3(build_http_provider(rpc_url))
     web3.middleware_onion.inject(geth_poa_middleware, layer=0)
 
     compiled_contract = compile_contract()
@@ -8,6 +8,7 @@ from sqlalchemy import (
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -91,7 +92,7 @@ class Vote(Base):
 
     id = Column(Integer, primary_key=True)
     election_id = Column(Integer, ForeignKey("elections.id"), nullable=False)
-    voter_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    voter_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     candidate_id = Column(Integer, ForeignKey("candidates.id"), nullable=False)
     tx_hash = Column(String(100), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -102,6 +103,8 @@ class Vote(Base):
 
     __table_args__ = (
         UniqueConstraint("election_id", "voter_id", name="uq_vote_election_voter"),
+        Index("ix_votes_election_candidate", "election_id", "candidate_id"),
+        Index("ix_votes_election_created", "election_id", "created_at"),
     )
 
     def to_dict(self) -> Dict:
@@ -113,3 +116,13 @@ class Vote(Base):
             "tx_hash": self.tx_hash,
             "created_at": self.created_at.isoformat(),
         }
+
+
+class VoteTally(Base):
+    """Running vote count per candidate, kept in step with ``votes`` on every insert."""
+
+    __tablename__ = "vote_tallies"
+
+    election_id = Column(Integer, ForeignKey("elections.id"), primary_key=True)
+    candidate_id = Column(Integer, ForeignKey("candidates.id"), primary_key=True)
+    votes = Column(Integer, nullable=False, default=0)
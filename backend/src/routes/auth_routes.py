@@ -1,18 +1,23 @@
 from __future__ import annotations
 
-import os
+import hashlib
+import threading
 
+from cachetools import TTLCache
+from eth_account import Account
 from eth_account.messages import encode_defunct
 from flask import Blueprint, current_app, jsonify, request
 from flask_jwt_extended import create_access_token
 from sqlalchemy.exc import IntegrityError
-from web3 import Web3
 
 from src.models import User
 from src.utils.db import session_scope
 
 auth_bp = Blueprint("auth", __name__)
 
+_signature_cache: TTLCache = TTLCache(maxsize=10000, ttl=300)
+_signature_cache_lock = threading.Lock()
+
 
 @auth_bp.post("/login")
 def login():
@@ -45,12 +50,24 @@ def login():
 
 
 def verify_signature(wallet_address: str, signature: str, nonce: str) -> bool:
-    """Validate signature created in MetaMask using a simple nonce message."""
+    """Validate signature created in MetaMask, memoizing recent outcomes."""
+    key = hashlib.sha256(f"{wallet_address}|{signature}|{nonce}".encode("utf-8")).digest()
+    with _signature_cache_lock:
+        cached = _signature_cache.get(key)
+    if cached is not None:
+        return cached
+
+    valid = _recover_and_compare(wallet_address, signature, nonce)
+    with _signature_cache_lock:
+        _signature_cache[key] = valid
+    return valid
+
+
+def _recover_and_compare(wallet_address: str, signature: str, nonce: str) -> bool:
     try:
-        rpc_url = os.getenv("RPC_URL")
-        w3 = Web3(Web3.HTTPProvider(rpc_url)) if rpc_url else Web3()
+        # A recuperacao e puramente local (ECDSA); nao precisa de provider Web3.
         message = encode_defunct(text=f"Login nonce: {nonce}")
-        recovered = w3.eth.account.recover_message(message, signature=signature)
+        recovered = Account.recover_message(message, signature=signature)
         return recovered.lower() == wallet_address.lower()
     except Exception as exc:  # pragma: no cover - fail closed
         current_app.logger.warning("Signature verification failed: %s", exc)
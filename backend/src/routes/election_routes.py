@@ -6,8 +6,9 @@ from flask_jwt_extended import get_jwt_identity, jwt_required
 from src.services.election_service import (
     create_election,
     get_election_results,
-    list_elections,
+    list_elections_json,
 )
+from src.utils.http_cache import conditional_json, conditional_json_body
 
 election_bp = Blueprint("elections", __name__)
 
@@ -15,8 +16,7 @@ election_bp = Blueprint("elections", __name__)
 @election_bp.get("")
 @jwt_required()
 def get_all_elections():
-    elections = list_elections()
-    return jsonify({"elections": elections}), 200
+    return conditional_json_body(list_elections_json())
 
 
 @election_bp.post("")
@@ -55,4 +55,4 @@ def election_results(election_id: int):
     results = get_election_results(election_id, include_blockchain=include_blockchain)
     if results is None:
         return jsonify({"message": "Election not found"}), 404
-    return jsonify(results), 200
+    return conditional_json(results)
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+
+from src.services.blockchain_service import is_tx_hash
+from src.services.election_service import get_transaction_status
+
+tx_bp = Blueprint("transactions", __name__)
+
+
+@tx_bp.get("/<string:tx_hash>")
+@jwt_required()
+def transaction_status(tx_hash: str):
+    # Cada hash novo ocupa um worker de recibos por ate RECEIPT_TIMEOUT: so
+    # hashes bem formados chegam ao servico.
+    if not is_tx_hash(tx_hash):
+        return jsonify({"message": "Invalid transaction hash"}), 400
+    status = get_transaction_status(tx_hash)
+    if status is None:
+        return jsonify({"message": "Blockchain unavailable"}), 503
+    if status["status"] == "pending":
+        return jsonify(status), 202
+    return jsonify(status), 200
@@ -1,13 +1,23 @@
 from __future__ import annotations
 
+import functools
 import json
 import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+import eth_abi
+import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
 from web3.contract import Contract
+from web3.exceptions import TimeExhausted, TransactionNotFound
 from web3.middleware import geth_poa_middleware
 
 try:
@@ -19,6 +29,35 @@ except ImportError:  # pragma: no cover - optional dependency for deployment
 CONTRACT_VERSION = os.getenv("SOLC_VERSION", "0.8.20")
 BASE_DIR = Path(__file__).resolve().parents[1]
 CONTRACT_PATH = BASE_DIR / "blockchain" / "Voting.sol"
+RPC_TIMEOUT_SECONDS = float(os.getenv("RPC_TIMEOUT", "10"))
+RECEIPT_TIMEOUT_SECONDS = float(os.getenv("RECEIPT_TIMEOUT", "120"))
+RESULTS_BATCH_WINDOW_SECONDS = float(os.getenv("RESULTS_BATCH_WINDOW_MS", "10")) / 1000
+ELECTION_WATCH_MAX_PENDING = int(os.getenv("ELECTION_WATCH_MAX_PENDING", "64"))
+TX_HASH_PATTERN = re.compile(r"0x[0-9a-fA-F]{64}")
+
+_rpc_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=3, backoff_factor=0.2),
+)
+_rpc_session = requests.Session()
+_rpc_session.mount("http://", _rpc_adapter)
+_rpc_session.mount("https://", _rpc_adapter)
+
+_default_service: Optional["BlockchainService"] = None
+_block_number_cache: TTLCache = TTLCache(maxsize=1, ttl=1)
+_block_number_lock = threading.Lock()
+_results_by_block: TTLCache = TTLCache(maxsize=1024, ttl=60)
+_results_lock = threading.Lock()
+_GET_RESULTS_SELECTOR = Web3.keccak(text="getResults(uint256)")[:4]
+_receipt_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="receipt")
+# Executor separado: consultas de /tx nao podem atrasar o preenchimento do ID das eleicoes.
+_election_watch_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="election-watch")
+_election_watches: Dict[str, Future] = {}
+_election_watches_lock = threading.Lock()
+_receipts: TTLCache = TTLCache(maxsize=10000, ttl=3600)
+_receipts_lock = threading.Lock()
+_default_service_lock = threading.Lock()
 
 
 class BlockchainUnavailable(Exception):
@@ -39,7 +78,7 @@ class BlockchainService:
         if not self.rpc_url or not self.contract_address:
             raise BlockchainUnavailable("RPC_URL and CONTRACT_ADDRESS are required")
 
-        self.web3 = Web3(Web3.HTTPProvider(self.rpc_url))
+        self.web3 = Web3(build_http_provider(self.rpc_url))
         if os.getenv("CHAIN_ID", "").isdigit():
             self.chain_id = int(os.getenv("CHAIN_ID"))
         else:
@@ -49,12 +88,10 @@ class BlockchainService:
         self.web3.middleware_onion.inject(geth_poa_middleware, layer=0)
 
         self.contract = self._load_contract()
+        self._results_batcher = ResultsBatcher(self)
 
     def _load_contract(self) -> Contract:
-        contract_interface = compile_contract()
-        abi = contract_interface["abi"]
-        address = Web3.to_checksum_address(self.contract_address)
-        return self.web3.eth.contract(address=address, abi=abi)
+        return load_contract(self.web3, self.contract_address)
 
     def create_election(self, title: str, candidates: List[str]) -> BlockchainResult:
         return self._transact("createElection", title, candidates)
@@ -64,11 +101,93 @@ class BlockchainService:
 
     def fetch_results(self, election_id: int) -> Optional[Tuple[List[str], List[int]]]:
         try:
-            results = self.contract.functions.getResults(election_id).call()
-            return results[0], [int(v) for v in results[1]]
+            block_number = self._latest_block_number()
+            key = (election_id, block_number)
+            with _results_lock:
+                cached = _results_by_block.get(key)
+            if cached is not None:
+                return cached
+
+            raw = self._results_batcher.fetch(election_id, block_number).result(
+                timeout=RPC_TIMEOUT_SECONDS * 2
+            )
+            names, counts = eth_abi.decode(["string[]", "uint256[]"], raw)
+            results = (list(names), [int(v) for v in counts])
+            with _results_lock:
+                _results_by_block[key] = results
+            return results
         except Exception:
             return None
 
+    def _latest_block_number(self) -> int:
+        with _block_number_lock:
+            block_number = _block_number_cache.get("latest")
+        if block_number is None:
+            block_number = self.web3.eth.block_number
+            with _block_number_lock:
+                _block_number_cache["latest"] = block_number
+        return block_number
+
+    def transaction_status(self, tx_hash: str) -> Dict[str, Any]:
+        """Return the known status of ``tx_hash``, watching it in background on first call."""
+        with _receipts_lock:
+            status = _receipts.get(tx_hash)
+            if status is None:
+                status = {"status": "pending", "tx_hash": tx_hash}
+                _receipts[tx_hash] = status
+                _receipt_executor.submit(self._await_receipt, tx_hash)
+        return dict(status)
+
+    def _await_receipt(self, tx_hash: str) -> None:
+        try:
+            receipt = self.web3.eth.wait_for_transaction_receipt(
+                tx_hash, timeout=RECEIPT_TIMEOUT_SECONDS
+            )
+            status = {
+                "status": "confirmed" if receipt.status == 1 else "failed",
+                "tx_hash": tx_hash,
+                "block_number": receipt.blockNumber,
+            }
+        except TimeExhausted:
+            status = {"status": "timeout", "tx_hash": tx_hash}
+        except Exception as exc:
+            status = {"status": "error", "tx_hash": tx_hash, "message": str(exc)}
+        with _receipts_lock:
+            _receipts[tx_hash] = status
+
+    def watch_election_creation(self, tx_hash: str) -> "Optional[Future[Optional[int]]]":
+        """Resolve, in background, the contract election ID emitted by ``tx_hash``.
+
+        Returns the watch already pending for ``tx_hash`` when there is one, and
+        ``None`` when ``ELECTION_WATCH_MAX_PENDING`` watches are already queued.
+        """
+        with _election_watches_lock:
+            future = _election_watches.get(tx_hash)
+            if future is not None:
+                return future
+            if len(_election_watches) >= ELECTION_WATCH_MAX_PENDING:
+                return None
+            future = _election_watch_executor.submit(self._election_id_from_receipt, tx_hash)
+            _election_watches[tx_hash] = future
+        future.add_done_callback(lambda _: _forget_election_watch(tx_hash))
+        return future
+
+    def _election_id_from_receipt(self, tx_hash: str) -> Optional[int]:
+        try:
+            self.web3.eth.get_transaction(tx_hash)
+        except TransactionNotFound:
+            # Hash desconhecido pelo no (nunca enviado): nao ha recibo a esperar.
+            return None
+        receipt = self.web3.eth.wait_for_transaction_receipt(
+            tx_hash, timeout=RECEIPT_TIMEOUT_SECONDS
+        )
+        if receipt.status != 1:
+            return None
+        events = self.contract.events.ElectionCreated().process_receipt(receipt)
+        if not events:
+            return None
+        return int(events[0]["args"]["electionId"])
+
     def _transact(self, function_name: str, *args) -> BlockchainResult:
         private_key = os.getenv("PRIVATE_KEY")
         account = os.getenv("ACCOUNT_ADDRESS")
@@ -80,12 +199,12 @@ class BlockchainService:
             )
 
         try:
-            nonce = self.web3.eth.get_transaction_count(account)
+            nonce, gas_price = fetch_nonce_and_gas_price(self.web3, account)
             tx = getattr(self.contract.functions, function_name)(*args).build_transaction(
                 {
                     "from": account,
                     "nonce": nonce,
-                    "gasPrice": self.web3.eth.gas_price,
+                    "gasPrice": gas_price,
                 }
             )
             tx["gas"] = tx.get("gas", 500000)
@@ -104,6 +223,175 @@ class BlockchainService:
             )
 
 
+def is_tx_hash(value: str) -> bool:
+    return bool(TX_HASH_PATTERN.fullmatch(value))
+
+
+def _forget_election_watch(tx_hash: str) -> None:
+    with _election_watches_lock:
+        _election_watches.pop(tx_hash, None)
+
+
+def build_http_provider(rpc_url: str) -> Web3.HTTPProvider:
+    """HTTP provider sharing a keep-alive connection pool across RPC calls."""
+    return Web3.HTTPProvider(
+        rpc_url,
+        session=_rpc_session,
+        request_kwargs={"timeout": RPC_TIMEOUT_SECONDS},
+    )
+
+
+@functools.lru_cache(maxsize=1024)
+def _encode_get_results(election_id: int) -> str:
+    return Web3.to_hex(_GET_RESULTS_SELECTOR + eth_abi.encode(["uint256"], [election_id]))
+
+
+class ResultsBatcher:
+    """Coalesces concurrent ``getResults`` reads into one JSON-RPC batch of ``eth_call``.
+
+    The first caller opens a short window; every election requested meanwhile is
+    fetched by the same HTTP request. Requests for an election already waiting in
+    the window share its future.
+    """
+
+    def __init__(
+        self, service: BlockchainService, window_seconds: float = RESULTS_BATCH_WINDOW_SECONDS
+    ) -> None:
+        self._service = service
+        self.window_seconds = window_seconds
+        self._pending: Dict[Tuple[int, int], Future] = {}
+        self._lock = threading.Lock()
+
+    def fetch(self, election_id: int, block_number: int) -> "Future[bytes]":
+        key = (election_id, block_number)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[key] = future
+            opens_window = len(self._pending) == 1
+        if opens_window:
+            timer = threading.Timer(self.window_seconds, self._flush)
+            timer.daemon = True
+            timer.start()
+        return future
+
+    def _flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            raw_by_key = self._call_batch(list(pending))
+        except Exception as exc:
+            for future in pending.values():
+                future.set_exception(exc)
+            return
+        for key, future in pending.items():
+            raw = raw_by_key.get(key)
+            if isinstance(raw, Exception):
+                future.set_exception(raw)
+            else:
+                future.set_result(raw)
+
+    def _call_batch(self, keys: List[Tuple[int, int]]) -> Dict[Tuple[int, int], Any]:
+        web3 = self._service.web3
+        address = self._service.contract.address
+        endpoint_uri = getattr(web3.provider, "endpoint_uri", None)
+        if endpoint_uri and len(keys) > 1:
+            batch = [
+                {
+                    "jsonrpc": "2.0",
+                    "id": index,
+                    "method": "eth_call",
+                    "params": [
+                        {"to": address, "data": _encode_get_results(election_id)},
+                        hex(block_number),
+                    ],
+                }
+                for index, (election_id, block_number) in enumerate(keys)
+            ]
+            try:
+                response = _rpc_session.post(
+                    endpoint_uri, json=batch, timeout=RPC_TIMEOUT_SECONDS
+                )
+                response.raise_for_status()
+                items = {item["id"]: item for item in response.json()}
+                return {
+                    key: Web3.to_bytes(hexstr=items[index]["result"])
+                    if "result" in items.get(index, {})
+                    else ValueError(items.get(index, {}).get("error", "missing response"))
+                    for index, key in enumerate(keys)
+                }
+            except Exception:
+                # Provedores sem suporte a batch: segue com chamadas individuais.
+                pass
+
+        results: Dict[Tuple[int, int], Any] = {}
+        for election_id, block_number in keys:
+            try:
+                results[(election_id, block_number)] = web3.eth.call(
+                    {"to": address, "data": _encode_get_results(election_id)},
+                    block_number,
+                )
+            except Exception as exc:
+                results[(election_id, block_number)] = exc
+        return results
+
+
+def fetch_nonce_and_gas_price(web3: Web3, account: str) -> Tuple[int, int]:
+    """Fetch nonce and gas price in a single JSON-RPC batch round trip.
+
+    web3.py 6 has no batching API, so the batch is posted directly through the
+    pooled session. Providers that reject batches fall back to two serial calls.
+    """
+    endpoint_uri = getattr(web3.provider, "endpoint_uri", None)
+    if endpoint_uri:
+        batch = [
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "eth_getTransactionCount",
+                "params": [account, "latest"],
+            },
+            {"jsonrpc": "2.0", "id": 2, "method": "eth_gasPrice", "params": []},
+        ]
+        try:
+            response = _rpc_session.post(
+                endpoint_uri, json=batch, timeout=RPC_TIMEOUT_SECONDS
+            )
+            response.raise_for_status()
+            results = {item["id"]: item["result"] for item in response.json()}
+            return int(results[1], 16), int(results[2], 16)
+        except Exception:
+            pass
+    return web3.eth.get_transaction_count(account), web3.eth.gas_price
+
+
+def get_default_service() -> BlockchainService:
+    """Return the process-wide service, building it on first use."""
+    global _default_service
+    if _default_service is None:
+        with _default_service_lock:
+            if _default_service is None:
+                _default_service = BlockchainService()
+    return _default_service
+
+
+def load_contract(web3: Web3, address: str) -> Contract:
+    """Return a contract wrapper, reusing the one built for the same Web3 and address."""
+    return _build_contract(web3, Web3.to_checksum_address(address))
+
+
+@functools.lru_cache(maxsize=32)
+def _build_contract(web3: Web3, checksum_address: str) -> Contract:
+    # O cache mantem referencia ao Web3, entao a chave nunca colide com uma
+    # instancia nova criada no mesmo endereco de memoria.
+    return web3.eth.contract(address=checksum_address, abi=compile_contract()["abi"])
+
+
+@functools.lru_cache(maxsize=1)
 def compile_contract() -> dict:
     cache_path = BASE_DIR / "blockchain" / "Voting.json"
     if cache_path.exists():
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency for multi-worker caching
+    redis = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_SECONDS = int(os.getenv("CHAIN_CACHE_TTL", "30"))
+NEGATIVE_CACHE_TTL_SECONDS = int(os.getenv("CHAIN_NEG_TTL", "5"))
+NEGATIVE_STATUSES = frozenset({"missing", "not_found"})
+
+
+class _Flight:
+    """Result of an in-progress load, handed to every request waiting on it."""
+
+    __slots__ = ("event", "entry", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.entry: Optional[Dict] = None
+        self.error: Optional[BaseException] = None
+
+
+class ChainResultCache:
+    """Cache of on-chain election results shared by every request in the process.
+
+    When ``REDIS_URL`` is configured (and ``redis`` is installed) entries are also
+    stored in Redis so all workers share them; any Redis failure falls back to the
+    local dictionary. Entries are plain dicts: ``{"status": "fresh", "names": [...],
+    "counts": [...], "synced_at": iso}`` for results, or ``{"status": "missing"}``
+    style negative entries kept for a shorter TTL.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        negative_ttl_seconds: int = NEGATIVE_CACHE_TTL_SECONDS,
+        redis_url: Optional[str] = None,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._local: Dict[int, Tuple[float, Dict]] = {}
+        self._redis = None
+        if redis_url and redis is not None:
+            self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+        self._inflight: Dict[int, _Flight] = {}
+        self._inflight_lock = threading.Lock()
+
+    def get(self, election_id: int) -> Optional[Dict]:
+        if self._redis is not None:
+            try:
+                raw = self._redis.get(self._key(election_id))
+                if raw:
+                    return json.loads(raw)
+            except Exception as exc:
+                logger.debug("Redis indisponivel para leitura do cache: %s", exc)
+            # Sem entrada no Redis: pode haver uma gravada localmente durante
+            # uma queda do Redis.
+
+        cached = self._local.get(election_id)
+        if not cached:
+            return None
+        expires_at, entry = cached
+        if time.monotonic() >= expires_at:
+            self._local.pop(election_id, None)
+            return None
+        return entry
+
+    def put(self, election_id: int, entry: Dict) -> None:
+        ttl = (
+            self.negative_ttl_seconds
+            if entry.get("status") in NEGATIVE_STATUSES
+            else self.ttl_seconds
+        )
+        if self._redis is not None:
+            try:
+                self._redis.setex(self._key(election_id), ttl, json.dumps(entry))
+                return
+            except Exception as exc:
+                logger.debug("Redis indisponivel para escrita do cache: %s", exc)
+        self._local[election_id] = (time.monotonic() + ttl, entry)
+
+    def get_or_load(
+        self, election_id: int, loader: Callable[[], Dict]
+    ) -> Tuple[Dict, bool]:
+        """Return ``(entry, from_cache)``; concurrent misses share a single ``loader`` call."""
+        entry = self.get(election_id)
+        if entry is not None:
+            return entry, True
+
+        with self._inflight_lock:
+            flight = self._inflight.get(election_id)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._inflight[election_id] = flight
+
+        if not leader:
+            completed = flight.event.wait(timeout=30)
+            # Resultados nao cacheaveis (ex.: "unavailable") e excecoes tambem
+            # vem do lider, sem repetir a chamada RPC em cada requisicao.
+            if flight.error is not None:
+                raise flight.error
+            if completed and flight.entry is not None:
+                return flight.entry, True
+            # Lider travado ou interrompido: segue sozinho.
+            return loader(), False
+
+        try:
+            entry = loader()
+            if entry.get("status") == "fresh" or entry.get("status") in NEGATIVE_STATUSES:
+                self.put(election_id, entry)
+            flight.entry = entry
+            return entry, False
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(election_id, None)
+            flight.event.set()
+
+    @staticmethod
+    def _key(election_id: int) -> str:
+        return f"chain:{election_id}"
@@ -1,19 +1,49 @@
 from __future__ import annotations
 
+import logging
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
-
-from src.models import Candidate, Election, User, Vote
-from src.services.blockchain_service import BlockchainService, BlockchainUnavailable
-from src.utils.db import session_scope
-
-_blockchain_service: Optional[BlockchainService] = None
-_chain_cache: Dict[int, Tuple[datetime, Tuple[List[str], List[int]]]] = {}
-CACHE_TTL_SECONDS = int(os.getenv("CHAIN_CACHE_TTL", "30"))
+from cachetools import LRUCache, TTLCache
+from flask import current_app, has_app_context
+from sqlalchemy import exists, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import raiseload, selectinload
+
+from src.models import Candidate, Election, User, Vote, election_candidates
+from src.services.blockchain_service import (
+    BlockchainService,
+    BlockchainUnavailable,
+    get_default_service,
+    is_tx_hash,
+)
+from src.services.chain_cache import ChainResultCache
+from src.services.tally_service import get_tallies, increment_tallies, seed_tallies
+from src.services.vote_buffer import (
+    VOTE_BUFFER_ENABLED,
+    is_duplicate_vote_error,
+    vote_buffer,
+)
+from src.utils.db import read_session_scope, session_scope
+from src.utils.json_provider import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+_chain_cache = ChainResultCache(redis_url=os.getenv("REDIS_URL"))
+ELECTIONS_CACHE_TTL_SECONDS = int(os.getenv("ELECTIONS_CACHE_TTL", "10"))
+_elections_cache: TTLCache = TTLCache(maxsize=2, ttl=ELECTIONS_CACHE_TTL_SECONDS)
+_elections_cache_lock = threading.Lock()
+LIST_ELECTIONS_BATCH_SIZE = 500
+_election_snapshots: LRUCache = LRUCache(maxsize=1024)
+_snapshot_lock = threading.Lock()
+# Carteira -> ID do usuario; enderecos nunca mudam, entao nao ha invalidacao.
+_user_ids: LRUCache = LRUCache(maxsize=100_000)
+_user_ids_lock = threading.Lock()
+ELECTION_COUNT_TTL_SECONDS = float(os.getenv("ELECTION_COUNT_TTL", "5"))
+_election_count_cache: Optional[Tuple[float, int]] = None
 
 
 def _format_blockchain_info(tx_hash: Optional[str]) -> Dict[str, str]:
@@ -29,13 +59,19 @@ def _format_blockchain_info(tx_hash: Optional[str]) -> Dict[str, str]:
 
 
 def get_blockchain_service() -> Optional[BlockchainService]:
-    global _blockchain_service
-    if _blockchain_service is None:
-        try:
-            _blockchain_service = BlockchainService()
-        except BlockchainUnavailable:
-            _blockchain_service = None
-    return _blockchain_service
+    if has_app_context() and "blockchain" in current_app.extensions:
+        return current_app.extensions["blockchain"]
+    try:
+        return get_default_service()
+    except BlockchainUnavailable:
+        return None
+
+
+def get_transaction_status(tx_hash: str) -> Optional[Dict]:
+    chain_service = get_blockchain_service()
+    if chain_service is None:
+        return None
+    return chain_service.transaction_status(tx_hash)
 
 
 def _resolve_chain_election_id(
@@ -51,7 +87,7 @@ def _resolve_chain_election_id(
         return None
 
     try:
-        election_count = chain_service.contract.functions.electionCount().call()
+        election_count = _get_election_count(chain_service)
     except Exception:
         # Se não conseguirmos consultar, devolvemos o ID calculado e deixamos a
         # transação lidar com qualquer erro. Isso evita mascarar problemas de RPC.
@@ -63,6 +99,21 @@ def _resolve_chain_election_id(
     return chain_election_id
 
 
+def _get_election_count(chain_service: BlockchainService) -> int:
+    global _election_count_cache
+    cached = _election_count_cache
+    if cached is not None and time.monotonic() - cached[0] < ELECTION_COUNT_TTL_SECONDS:
+        return cached[1]
+    election_count = chain_service.contract.functions.electionCount().call()
+    _election_count_cache = (time.monotonic(), election_count)
+    return election_count
+
+
+def _invalidate_election_count() -> None:
+    global _election_count_cache
+    _election_count_cache = None
+
+
 def create_election(
     title: str,
     description: str,
@@ -71,6 +122,8 @@ def create_election(
     tx_hash: Optional[str] = None,
     chain_election_id: Optional[int] = None,
 ) -> Dict:
+    # Nomes repetidos viram um unico candidato (e um unico vinculo na eleicao).
+    candidates = list(dict.fromkeys(candidates))
     with session_scope() as session:
         user = session.execute(
             select(User).where(User.wallet_address == creator_wallet)
@@ -79,63 +132,197 @@ def create_election(
             raise ValueError("Creator not found. Authenticate before creating elections.")
 
         election = Election(title=title, description=description, created_by=user.id)
-        for candidate_name in candidates:
-            candidate = session.execute(
-                select(Candidate).where(Candidate.name == candidate_name)
-            ).scalar_one_or_none()
-            if candidate is None:
-                candidate = Candidate(name=candidate_name)
-            election.candidates.append(candidate)
-
         if chain_election_id is not None:
             # Persiste o mapeamento explicito entre a eleicao no banco
             # e o ID correspondente no contrato.
             election.chain_election_id = chain_election_id
-
         session.add(election)
         session.flush()
-        election_dict = election.to_dict()
 
+        candidate_ids = dict(
+            session.execute(
+                select(Candidate.name, Candidate.id).where(Candidate.name.in_(candidates))
+            ).all()
+        )
+        new_names = [name for name in candidates if name not in candidate_ids]
+        if new_names:
+            candidate_ids.update(_insert_candidates(session, new_names))
+
+        # Vincula todos os candidatos com um unico INSERT em lote na tabela associativa.
+        session.execute(
+            insert(election_candidates),
+            [
+                {"election_id": election.id, "candidate_id": candidate_ids[name]}
+                for name in candidates
+            ],
+        )
+        seed_tallies(session, election.id, [candidate_ids[name] for name in candidates])
+        election_dict = {
+            "id": election.id,
+            "title": election.title,
+            "description": election.description,
+            "created_at": election.created_at.isoformat(),
+            "chain_election_id": election.chain_election_id,
+            "candidates": [{"id": candidate_ids[name], "name": name} for name in candidates],
+        }
+
+    _invalidate_election_count()
+    _invalidate_elections_cache()
+    if tx_hash and chain_election_id is None:
+        _schedule_chain_id_backfill(election_dict["id"], tx_hash)
     election_dict["blockchain"] = _format_blockchain_info(tx_hash)
     return election_dict
 
 
+def _schedule_chain_id_backfill(election_id: int, tx_hash: str) -> None:
+    """Fill ``chain_election_id`` from the ElectionCreated event once ``tx_hash`` is mined."""
+    if not is_tx_hash(tx_hash):
+        return
+    chain_service = get_blockchain_service()
+    if chain_service is None:
+        return
+
+    def _persist(future) -> None:
+        try:
+            chain_election_id = future.result()
+        except Exception as exc:
+            logger.warning("Falha ao obter o ID da eleicao %s na blockchain: %s", election_id, exc)
+            return
+        if chain_election_id is None:
+            return
+        with session_scope() as session:
+            session.execute(
+                update(Election)
+                .where(Election.id == election_id)
+                .where(Election.chain_election_id.is_(None))
+                .values(chain_election_id=chain_election_id)
+            )
+        with _snapshot_lock:
+            _election_snapshots.pop(election_id, None)
+        _invalidate_elections_cache()
+
+    future = chain_service.watch_election_creation(tx_hash)
+    if future is None:
+        logger.warning(
+            "Muitas eleicoes aguardando recibo; ID da eleicao %s na blockchain nao sera preenchido",
+            election_id,
+        )
+        return
+    future.add_done_callback(_persist)
+
+
+def _insert_candidates(session, names: List[str]) -> Dict[str, int]:
+    if session.get_bind().dialect.insert_executemany_returning:
+        rows = session.execute(
+            insert(Candidate).returning(Candidate.name, Candidate.id),
+            [{"name": name} for name in names],
+        )
+        return dict(rows.all())
+
+    # MySQL nao suporta RETURNING em lote; o flush do ORM recupera os IDs gerados.
+    new_candidates = [Candidate(name=name) for name in names]
+    session.add_all(new_candidates)
+    session.flush()
+    return {candidate.name: candidate.id for candidate in new_candidates}
+
+
 def list_elections() -> List[Dict]:
-    with session_scope() as session:
-        elections = (
-            session.query(Election)
-            .options(joinedload(Election.candidates))
-            .order_by(Election.created_at.desc())
-            .all()
+    with _elections_cache_lock:
+        cached = _elections_cache.get("all")
+    if cached is not None:
+        return cached
+
+    serialized: List[Dict] = []
+    with read_session_scope() as session:
+        # Uma unica consulta (eleicao LEFT JOIN candidatos) lida em lotes por um
+        # cursor no servidor; as linhas de cada eleicao chegam consecutivas.
+        rows = session.execute(
+            select(
+                Election.id,
+                Election.title,
+                Election.description,
+                Election.created_at,
+                Election.chain_election_id,
+                Candidate.id.label("candidate_id"),
+                Candidate.name.label("candidate_name"),
+            )
+            .outerjoin(election_candidates, election_candidates.c.election_id == Election.id)
+            .outerjoin(Candidate, Candidate.id == election_candidates.c.candidate_id)
+            .order_by(Election.created_at.desc(), Election.id.desc())
+            .execution_options(stream_results=True, yield_per=LIST_ELECTIONS_BATCH_SIZE)
         )
-        return [election.to_dict() for election in elections]
+        current = None
+        for row in rows:
+            if current is None or current["id"] != row.id:
+                current = {
+                    "id": row.id,
+                    "title": row.title,
+                    "description": row.description,
+                    "created_at": row.created_at.isoformat(),
+                    "chain_election_id": row.chain_election_id,
+                    "candidates": [],
+                }
+                serialized.append(current)
+            if row.candidate_id is not None:
+                current["candidates"].append(
+                    {"id": row.candidate_id, "name": row.candidate_name}
+                )
+
+    with _elections_cache_lock:
+        _elections_cache["all"] = serialized
+    return serialized
+
+
+def list_elections_json() -> bytes:
+    """``{"elections": [...]}`` already encoded, reused until the listing cache expires."""
+    with _elections_cache_lock:
+        cached = _elections_cache.get("json")
+    if cached is not None:
+        return cached
+
+    body = dumps_bytes({"elections": list_elections()})
+    with _elections_cache_lock:
+        _elections_cache["json"] = body
+    return body
+
+
+def _invalidate_elections_cache() -> None:
+    with _elections_cache_lock:
+        _elections_cache.clear()
 
 
 def record_vote(
     election_id: int, candidate_id: int, wallet: str, tx_hash: Optional[str]
 ) -> Dict:
     with session_scope() as session:
-        user = session.execute(select(User).where(User.wallet_address == wallet)).scalar_one_or_none()
-        if user is None:
-            user = User(wallet_address=wallet, is_admin=False)
-            session.add(user)
-            session.flush()
-
-        election = (
-            session.query(Election)
-            .options(joinedload(Election.candidates))
-            .filter(Election.id == election_id)
-            .first()
-        )
-        if election is None:
+        # Todas as verificacoes previas ao voto em uma unica ida ao banco:
+        # usuario, eleicao, candidato na cedula e voto duplicado.
+        with _user_ids_lock:
+            user_id = _user_ids.get(wallet)
+        if user_id is None:
+            user_id = (
+                select(User.id).where(User.wallet_address == wallet).scalar_subquery()
+            )
+        else:
+            user_id = literal(user_id)
+        checks = session.execute(
+            select(
+                user_id.label("user_id"),
+                exists().where(Election.id == election_id).label("election_exists"),
+                exists()
+                .where(election_candidates.c.election_id == election_id)
+                .where(election_candidates.c.candidate_id == candidate_id)
+                .label("candidate_exists"),
+                exists()
+                .where(Vote.election_id == election_id)
+                .where(Vote.voter_id == user_id)
+                .label("already_voted"),
+            )
+        ).one()
+
+        if not checks.election_exists:
             return {"status": "error", "message": "Election not found", "code": 404}
-
-        candidate_index = None
-        for index, candidate in enumerate(election.candidates):
-            if candidate.id == candidate_id:
-                candidate_index = index
-                break
-        if candidate_index is None:
+        if not checks.candidate_exists:
             return {"status": "error", "message": "Candidate not found", "code": 404}
 
         if not tx_hash:
@@ -145,59 +332,115 @@ def record_vote(
                 "code": 400,
             }
 
-        existing_vote = (
-            session.query(Vote)
-            .filter(Vote.election_id == election_id, Vote.voter_id == user.id)
-            .first()
-        )
-        if existing_vote:
+        if checks.already_voted or (
+            checks.user_id is not None
+            and vote_buffer.is_pending(election_id, checks.user_id)
+        ):
             return {
                 "status": "error",
                 "message": "Wallet already voted for this election",
                 "code": 409,
             }
 
-        vote = Vote(
-            election_id=election_id,
-            voter_id=user.id,
-            candidate_id=candidate_id,
-            tx_hash=tx_hash,
-        )
-        session.add(vote)
+        voter_id = checks.user_id
+        if voter_id is None:
+            # Usuario criado nesta transacao: fica fora do cache ate estar
+            # confirmado, pois um rollback descartaria o ID.
+            voter_id = _create_user(session, wallet)
+        else:
+            with _user_ids_lock:
+                _user_ids[wallet] = voter_id
+
+        if not VOTE_BUFFER_ENABLED:
+            return _insert_vote(session, election_id, voter_id, candidate_id, tx_hash)
+
+    # O eleitor pode ter sido criado na transacao acima: o voto so entra na fila
+    # depois do commit, para o flush nunca gravar um voter_id desfeito ou invisivel.
+    return _enqueue_vote(election_id, voter_id, candidate_id, tx_hash)
+
+
+def _insert_vote(
+    session, election_id: int, voter_id: int, candidate_id: int, tx_hash: str
+) -> Dict:
+    vote = Vote(
+        election_id=election_id,
+        voter_id=voter_id,
+        candidate_id=candidate_id,
+        tx_hash=tx_hash,
+    )
+    session.add(vote)
+    try:
         session.flush()
+    except IntegrityError as exc:
+        # Duas requisicoes simultaneas da mesma carteira podem passar pela
+        # verificacao acima; a constraint unica decide qual voto fica.
+        session.rollback()
+        if not is_duplicate_vote_error(exc):
+            raise
+        return {
+            "status": "error",
+            "message": "Wallet already voted for this election",
+            "code": 409,
+        }
+    increment_tallies(session, [{"election_id": election_id, "candidate_id": candidate_id}])
+    return {
+        "status": "ok",
+        "vote": vote.to_dict(),
+        "blockchain": _format_blockchain_info(tx_hash),
+    }
+
 
-        response = {
-            "status": "ok",
-            "vote": vote.to_dict(),
-            "blockchain": _format_blockchain_info(tx_hash),
+def _enqueue_vote(
+    election_id: int, voter_id: int, candidate_id: int, tx_hash: str
+) -> Dict:
+    row = vote_buffer.enqueue(election_id, voter_id, candidate_id, tx_hash)
+    if row is None:
+        return {
+            "status": "error",
+            "message": "Wallet already voted for this election",
+            "code": 409,
         }
-    return response
+    return {
+        "status": "ok",
+        "vote": {
+            "id": None,
+            **row,
+            "created_at": row["created_at"].isoformat(),
+        },
+        "blockchain": _format_blockchain_info(tx_hash),
+    }
+
+
+def _create_user(session, wallet: str) -> int:
+    """Insert the voter in the caller's transaction; reuse the row a concurrent request created."""
+    user = User(wallet_address=wallet, is_admin=False)
+    session.add(user)
+    try:
+        session.flush()
+        return user.id
+    except IntegrityError:
+        # Ate aqui a transacao so fez leituras, entao o rollback nao descarta nada.
+        session.rollback()
+        return session.execute(
+            select(User.id).where(User.wallet_address == wallet)
+        ).scalar_one()
 
 
 def get_election_results(
     election_id: int, include_blockchain: bool = True
 ) -> Optional[Dict]:
-    with session_scope() as session:
-        election = (
-            session.query(Election)
-            .options(joinedload(Election.candidates))
-            .filter(Election.id == election_id)
-            .first()
-        )
-        if election is None:
+    with read_session_scope() as session:
+        election_dict = _election_snapshot(session, election_id)
+        if election_dict is None:
             return None
-        chain_election_id = getattr(election, "chain_election_id", None)
-        election_dict = election.to_dict()
+        chain_election_id = election_dict.get("chain_election_id")
 
-        votes = (
-            session.query(Vote.candidate_id)
-            .filter(Vote.election_id == election_id)
-            .all()
-        )
-        vote_counts = {candidate["id"]: 0 for candidate in election_dict["candidates"]}
-        for (candidate_id,) in votes:
-            if candidate_id in vote_counts:
-                vote_counts[candidate_id] += 1
+        # Contagens mantidas a cada voto em vote_tallies: uma linha por candidato.
+        tallies = get_tallies(session, election_id)
+        vote_counts = {
+            candidate["id"]: tallies.get(candidate["id"], 0)
+            for candidate in election_dict["candidates"]
+        }
 
     blockchain_meta = {
         "status": "skipped" if not include_blockchain else "unavailable",
@@ -207,38 +450,19 @@ def get_election_results(
     blockchain_data = None
 
     if include_blockchain:
-        cached = _get_cached_chain_results(election_id)
-        if cached:
-            candidate_names, chain_counts, cached_at = cached
-            blockchain_data = (candidate_names, chain_counts)
+        entry, from_cache = _chain_cache.get_or_load(
+            election_id, lambda: _load_chain_results(election_id, chain_election_id)
+        )
+        if entry.get("status") == "fresh":
+            blockchain_data = (entry["names"], entry["counts"])
             blockchain_meta = {
-                "status": "cached",
-                "cached": True,
-                "last_synced": cached_at.isoformat(),
+                "status": "cached" if from_cache else "fresh",
+                "cached": from_cache,
+                "last_synced": entry["synced_at"],
             }
         else:
-            chain_service = get_blockchain_service()
-            if chain_service:
-                effective_chain_id = chain_election_id
-                if effective_chain_id is None:
-                    effective_chain_id = _resolve_chain_election_id(election_id, chain_service)
-                if effective_chain_id is not None:
-                    blockchain_data = chain_service.fetch_results(effective_chain_id)
-                    if blockchain_data:
-                        _store_chain_results(
-                            election_id, blockchain_data[0], blockchain_data[1]
-                        )
-                        blockchain_meta = {
-                            "status": "fresh",
-                            "cached": False,
-                            "last_synced": datetime.utcnow().isoformat(),
-                        }
-                    else:
-                        blockchain_meta["status"] = "missing"
-                else:
-                    blockchain_meta["status"] = "not_found"
-            else:
-                blockchain_meta["status"] = "disabled"
+            blockchain_meta["status"] = entry["status"]
+            blockchain_meta["cached"] = from_cache
 
     if blockchain_data:
         candidate_names, chain_counts = blockchain_data
@@ -249,24 +473,15 @@ def get_election_results(
         if candidate_names != db_candidate_names:
             blockchain_meta["status"] = "mismatch"
             blockchain_data = None
-            chain_results = [
-                {
-                    "candidate": candidate["name"],
-                    "votes": vote_counts.get(candidate["id"], 0),
-                }
-                for candidate in election_dict["candidates"]
-            ]
-        else:
-            chain_results = [
-                {"candidate": candidate_names[idx], "votes": chain_counts[idx]}
-                for idx in range(len(candidate_names))
-            ]
+
+    if blockchain_data:
+        chain_results = [
+            {"candidate": name, "votes": votes}
+            for name, votes in zip(candidate_names, chain_counts)
+        ]
     else:
         chain_results = [
-            {
-                "candidate": candidate["name"],
-                "votes": vote_counts.get(candidate["id"], 0),
-            }
+            {"candidate": candidate["name"], "votes": vote_counts[candidate["id"]]}
             for candidate in election_dict["candidates"]
         ]
 
@@ -278,20 +493,48 @@ def get_election_results(
     }
 
 
-def _get_cached_chain_results(
-    election_id: int,
-) -> Optional[Tuple[List[str], List[int], datetime]]:
-    cached = _chain_cache.get(election_id)
-    if not cached:
-        return None
-    cached_at, data = cached
-    if datetime.utcnow() - cached_at > timedelta(seconds=CACHE_TTL_SECONDS):
-        _chain_cache.pop(election_id, None)
+def _election_snapshot(session, election_id: int) -> Optional[Dict]:
+    """Serialized election, cached once its ``chain_election_id`` is known (nothing else changes)."""
+    with _snapshot_lock:
+        snapshot = _election_snapshots.get(election_id)
+    if snapshot is not None:
+        return snapshot
+
+    election = session.execute(
+        select(Election)
+        .options(selectinload(Election.candidates), raiseload("*"))
+        .where(Election.id == election_id)
+    ).scalar_one_or_none()
+    if election is None:
+        # Ausencias nao sao cacheadas: a eleicao pode ser criada em seguida.
         return None
-    return data[0], data[1], cached_at
-
-
-def _store_chain_results(
-    election_id: int, candidate_names: List[str], counts: List[int]
-) -> None:
-    _chain_cache[election_id] = (datetime.utcnow(), (candidate_names, counts))
+    snapshot = election.to_dict()
+    if snapshot.get("chain_election_id") is None:
+        # O ID da blockchain ainda pode ser preenchido pelo watcher de outro
+        # worker do gunicorn; so snapshots completos ficam no cache.
+        return snapshot
+    with _snapshot_lock:
+        _election_snapshots[election_id] = snapshot
+    return snapshot
+
+
+def _load_chain_results(election_id: int, chain_election_id: Optional[int]) -> Dict:
+    chain_service = get_blockchain_service()
+    if not chain_service:
+        return {"status": "disabled"}
+
+    effective_chain_id = chain_election_id
+    if effective_chain_id is None:
+        effective_chain_id = _resolve_chain_election_id(election_id, chain_service)
+    if effective_chain_id is None:
+        return {"status": "not_found"}
+
+    blockchain_data = chain_service.fetch_results(effective_chain_id)
+    if not blockchain_data:
+        return {"status": "missing"}
+    return {
+        "status": "fresh",
+        "names": blockchain_data[0],
+        "counts": blockchain_data[1],
+        "synced_at": datetime.utcnow().isoformat(),
+    }
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from sqlalchemy import bindparam, exists, func, insert, select, update
+
+from src.models import Vote, VoteTally, election_candidates
+
+_tallies = VoteTally.__table__
+
+_increment_tally = (
+    update(_tallies)
+    .where(_tallies.c.election_id == bindparam("tally_election_id"))
+    .where(_tallies.c.candidate_id == bindparam("tally_candidate_id"))
+    .values(votes=_tallies.c.votes + bindparam("delta"))
+)
+
+
+def seed_tallies(session, election_id: int, candidate_ids: List[int]) -> None:
+    session.execute(
+        insert(_tallies),
+        [
+            {"election_id": election_id, "candidate_id": candidate_id, "votes": 0}
+            for candidate_id in candidate_ids
+        ],
+    )
+
+
+def increment_tallies(session, votes: Iterable[Dict]) -> None:
+    """Add ``votes`` (dicts with election_id/candidate_id) to their tallies in one executemany."""
+    deltas = Counter((vote["election_id"], vote["candidate_id"]) for vote in votes)
+    if not deltas:
+        return
+    session.execute(
+        _increment_tally,
+        [
+            {"tally_election_id": election_id, "tally_candidate_id": candidate_id, "delta": delta}
+            for (election_id, candidate_id), delta in deltas.items()
+        ],
+    )
+
+
+def get_tallies(session, election_id: int) -> Dict[int, int]:
+    rows = session.execute(
+        select(_tallies.c.candidate_id, _tallies.c.votes).where(
+            _tallies.c.election_id == election_id
+        )
+    ).all()
+    return dict(rows)
+
+
+def backfill_tallies(session) -> None:
+    """Create tallies missing for elections recorded before ``vote_tallies`` existed."""
+    vote_count = (
+        select(func.count(Vote.id))
+        .where(Vote.election_id == election_candidates.c.election_id)
+        .where(Vote.candidate_id == election_candidates.c.candidate_id)
+        .scalar_subquery()
+    )
+    missing = select(
+        election_candidates.c.election_id,
+        election_candidates.c.candidate_id,
+        vote_count,
+    ).where(
+        ~exists()
+        .where(_tallies.c.election_id == election_candidates.c.election_id)
+        .where(_tallies.c.candidate_id == election_candidates.c.candidate_id)
+    )
+    session.execute(
+        insert(_tallies).from_select(["election_id", "candidate_id", "votes"], missing)
+    )
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from src.models import Vote
+from src.services.tally_service import increment_tallies
+from src.utils.db import session_scope
+
+logger = logging.getLogger(__name__)
+
+VOTE_BUFFER_ENABLED = os.getenv("VOTE_BUFFER_ENABLED", "false").lower() == "true"
+VOTE_BUFFER_MAX_BATCH = int(os.getenv("VOTE_BUFFER_MAX_BATCH", "1000"))
+VOTE_BUFFER_INTERVAL_SECONDS = float(os.getenv("VOTE_BUFFER_INTERVAL_MS", "50")) / 1000
+VOTE_BUFFER_MAX_RETRY_DELAY_SECONDS = (
+    float(os.getenv("VOTE_BUFFER_MAX_RETRY_DELAY_MS", "5000")) / 1000
+)
+
+
+def is_duplicate_vote_error(exc: IntegrityError) -> bool:
+    """True when ``exc`` is the one-vote-per-voter constraint, not an FK or other failure."""
+    message = str(exc.orig)
+    return "uq_vote_election_voter" in message or (
+        "votes.election_id" in message and "votes.voter_id" in message
+    )
+
+
+class VoteBuffer:
+    """Accumulates votes in memory and inserts them in multi-row batches."""
+
+    def __init__(
+        self,
+        max_batch: int = VOTE_BUFFER_MAX_BATCH,
+        interval_seconds: float = VOTE_BUFFER_INTERVAL_SECONDS,
+    ) -> None:
+        self.max_batch = max_batch
+        self.interval_seconds = interval_seconds
+        self._queue: "queue.Queue[Dict]" = queue.Queue()
+        self._pending: Set[Tuple[int, int]] = set()
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._thread_lock = threading.Lock()
+
+    def enqueue(
+        self, election_id: int, voter_id: int, candidate_id: int, tx_hash: str
+    ) -> Optional[Dict]:
+        """Queue a vote; returns None when the voter already has one pending."""
+        key = (election_id, voter_id)
+        with self._pending_lock:
+            if key in self._pending:
+                return None
+            self._pending.add(key)
+
+        row = {
+            "election_id": election_id,
+            "voter_id": voter_id,
+            "candidate_id": candidate_id,
+            "tx_hash": tx_hash,
+            "created_at": datetime.utcnow(),
+        }
+        self._queue.put(row)
+        self._ensure_worker()
+        return row
+
+    def is_pending(self, election_id: int, voter_id: int) -> bool:
+        with self._pending_lock:
+            return (election_id, voter_id) in self._pending
+
+    def flush(self) -> int:
+        """Write everything queued so far; safe to call from any thread."""
+        written = 0
+        with self._flush_lock:
+            while True:
+                batch = self._drain()
+                if not batch:
+                    return written
+                written += self._write(batch)
+
+    def _ensure_worker(self) -> None:
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="vote-buffer", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        failures = 0
+        while True:
+            time.sleep(self._retry_delay(failures))
+            if self._queue.empty():
+                continue
+            try:
+                self.flush()
+                failures = 0
+            except Exception:  # pragma: no cover - worker must keep running
+                failures += 1
+                logger.exception(
+                    "Falha ao gravar lote de votos (tentativa %s); votos devolvidos a fila",
+                    failures,
+                )
+
+    def _retry_delay(self, failures: int) -> float:
+        if not failures:
+            return self.interval_seconds
+        return min(
+            VOTE_BUFFER_MAX_RETRY_DELAY_SECONDS, self.interval_seconds * (2 ** failures)
+        )
+
+    def _drain(self) -> List[Dict]:
+        batch: List[Dict] = []
+        while len(batch) < self.max_batch:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict]) -> int:
+        try:
+            with session_scope() as session:
+                session.execute(insert(Vote), batch)
+                increment_tallies(session, batch)
+        except IntegrityError:
+            return self._write_rows(batch)
+        except Exception:
+            # O cliente ja recebeu 200 por estes votos: falhas transitorias
+            # (conexao, lock, pool) devolvem o lote a fila, ainda pendente.
+            self._requeue(batch)
+            raise
+        self._release(batch)
+        return len(batch)
+
+    def _write_rows(self, batch: List[Dict]) -> int:
+        # Outro processo gravou um dos votos: insere um a um e descarta os duplicados.
+        written = 0
+        kept: List[Dict] = []
+        error: Optional[IntegrityError] = None
+        for index, row in enumerate(batch):
+            try:
+                with session_scope() as session:
+                    session.execute(insert(Vote), [row])
+                    increment_tallies(session, [row])
+                written += 1
+            except IntegrityError as exc:
+                if not is_duplicate_vote_error(exc):
+                    # FK ou outra restricao: o voto ja foi confirmado ao cliente,
+                    # entao continua na fila em vez de ser descartado.
+                    logger.error(
+                        "Voto nao gravado (eleicao %s, eleitor %s): %s",
+                        row["election_id"],
+                        row["voter_id"],
+                        exc.orig,
+                    )
+                    kept.append(row)
+                    error = exc
+                    continue
+                logger.info(
+                    "Voto duplicado descartado (eleicao %s, eleitor %s)",
+                    row["election_id"],
+                    row["voter_id"],
+                )
+            except Exception:
+                self._requeue(kept + batch[index:])
+                raise
+            self._release([row])
+        if error is not None:
+            self._requeue(kept)
+            raise error
+        return written
+
+    def _requeue(self, rows: List[Dict]) -> None:
+        for row in rows:
+            self._queue.put(row)
+
+    def _release(self, rows: List[Dict]) -> None:
+        with self._pending_lock:
+            for row in rows:
+                self._pending.discard((row["election_id"], row["voter_id"]))
+
+    def _flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(
+                "Encerrando com %s votos nao gravados", self._queue.qsize()
+            )
+
+
+vote_buffer = VoteBuffer()
+atexit.register(vote_buffer._flush_at_exit)
@@ -1,27 +1,93 @@
 from __future__ import annotations
 
+import atexit
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 
 from sqlalchemy import create_engine
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 engine = None
 SessionLocal = None
+read_engine = None
+ReadSessionLocal = None
 
 
-def init_engine(database_uri: str) -> None:
-    global engine, SessionLocal
+def init_engine(
+    database_uri: str,
+    pool_size: int = 20,
+    max_overflow: int = 40,
+    pool_timeout: int = 30,
+    pool_recycle: int = 1800,
+    pool_pre_ping: bool = True,
+    replica_uri: Optional[str] = None,
+) -> None:
+    global engine, SessionLocal, read_engine, ReadSessionLocal
     if engine:
         return
+    pool_options = {
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": pool_timeout,
+        "pool_recycle": pool_recycle,
+        "pool_pre_ping": pool_pre_ping,
+    }
+    engine = _build_engine(database_uri, **pool_options)
+    SessionLocal = _build_session_factory(engine)
+
+    # Sem replica configurada, as leituras usam o mesmo engine/sessao do primario.
+    if replica_uri and replica_uri != database_uri:
+        read_engine = _build_engine(replica_uri, **pool_options)
+        ReadSessionLocal = _build_session_factory(read_engine)
+    else:
+        read_engine = engine
+        ReadSessionLocal = SessionLocal
+
+
+def _build_engine(
+    database_uri: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_timeout: int,
+    pool_recycle: int,
+    pool_pre_ping: bool,
+):
     connect_args = {}
+    pool_args = {}
     if database_uri.startswith("sqlite"):
+        # SQLite usa pools proprios (SingletonThreadPool/QueuePool sem rede);
+        # os parametros de dimensionamento so fazem sentido para MySQL/Postgres.
         connect_args = {"check_same_thread": False}
-    engine = create_engine(
-        database_uri, pool_pre_ping=True, future=True, connect_args=connect_args
+        if _is_sqlite_memory(database_uri):
+            # Banco em memoria existe apenas na conexao que o criou: todas as
+            # sessoes precisam compartilhar essa mesma conexao.
+            pool_args = {"poolclass": StaticPool}
+    else:
+        pool_args = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": pool_timeout,
+            "pool_recycle": pool_recycle,
+        }
+    return create_engine(
+        database_uri,
+        pool_pre_ping=pool_pre_ping,
+        future=True,
+        connect_args=connect_args,
+        **pool_args,
     )
-    SessionLocal = scoped_session(
-        sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+
+def _is_sqlite_memory(database_uri: str) -> bool:
+    return database_uri in ("sqlite://", "sqlite:///:memory:") or "mode=memory" in database_uri
+
+
+def _build_session_factory(bind) -> scoped_session:
+    return scoped_session(
+        sessionmaker(
+            bind=bind, autoflush=False, autocommit=False, expire_on_commit=False
+        )
     )
 
 
@@ -31,9 +97,17 @@ def get_session():
     return SessionLocal()
 
 
+def get_read_session():
+    if ReadSessionLocal is None:
+        raise RuntimeError("Database engine is not initialized")
+    return ReadSessionLocal()
+
+
 def remove_session() -> None:
     if SessionLocal is not None:
         SessionLocal.remove()
+    if ReadSessionLocal is not None and ReadSessionLocal is not SessionLocal:
+        ReadSessionLocal.remove()
 
 
 def get_engine():
@@ -52,4 +126,19 @@ def session_scope() -> Generator:
         session.rollback()
         raise
     finally:
-        session.close()
+        # remove() fecha a sessao e libera o registro da thread atual, evitando
+        # sessoes acumuladas em threads de pools (executores, gthread).
+        SessionLocal.remove()
+
+
+@contextmanager
+def read_session_scope() -> Generator:
+    """Session for read-only work, routed to the replica when one is configured."""
+    session = get_read_session()
+    try:
+        yield session
+    finally:
+        ReadSessionLocal.remove()
+
+
+atexit.register(remove_session)
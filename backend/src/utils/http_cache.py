@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Any
+
+from flask import Response, current_app, jsonify, request
+
+
+def conditional_json(payload: Any, max_age: int = 5) -> Response:
+    """Serialize ``payload`` with an ETag, answering 304 when the client copy is current."""
+    return _conditional(jsonify(payload), max_age)
+
+
+def conditional_json_body(body: bytes, max_age: int = 5) -> Response:
+    """Same as :func:`conditional_json` for a body that is already encoded."""
+    return _conditional(current_app.response_class(body, mimetype="application/json"), max_age)
+
+
+def _conditional(response: Response, max_age: int) -> Response:
+    response.add_etag()
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    return response.make_conditional(request)
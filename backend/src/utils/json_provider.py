@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import typing as t
+
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider backed by orjson, keeping Flask's sorted-key output."""
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: t.Union[str, bytes], **kwargs: t.Any) -> t.Any:
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(obj)
+        return self._app.response_class(
+            self._dumps_bytes(obj) + b"\n", mimetype=self.mimetype
+        )
+
+    def _dumps_bytes(self, obj: t.Any) -> bytes:
+        return orjson.dumps(obj, default=self.default, option=_ORJSON_OPTIONS)
+
+
+def dumps_bytes(obj: t.Any) -> bytes:
+    """Encode ``obj`` exactly as the provider would, for bodies built outside a request."""
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=_ORJSON_OPTIONS)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from cachetools import TTLCache
+from flask_jwt_extended import JWTManager
+
+_token_cache: TTLCache = TTLCache(maxsize=10000, ttl=30)
+_token_cache_lock = threading.Lock()
+
+
+def _token_key(encoded_token: str) -> str:
+    return hashlib.sha256(encoded_token.encode("utf-8")).hexdigest()[:32]
+
+
+def get_cached_token(encoded_token: str) -> Optional[Dict]:
+    key = _token_key(encoded_token)
+    with _token_cache_lock:
+        cached: Optional[Tuple[Dict, Optional[float]]] = _token_cache.get(key)
+        if cached is None:
+            return None
+        payload, exp = cached
+        if exp is not None and time.time() >= exp:
+            _token_cache.pop(key, None)
+            return None
+    return dict(payload)
+
+
+def store_cached_token(encoded_token: str, payload: Dict) -> None:
+    exp = payload.get("exp")
+    if exp is not None and time.time() >= exp:
+        return
+    with _token_cache_lock:
+        _token_cache[_token_key(encoded_token)] = (dict(payload), exp)
+
+
+def clear_token_cache() -> None:
+    with _token_cache_lock:
+        _token_cache.clear()
+
+
+class CachedJWTManager(JWTManager):
+    """JWTManager que reaproveita tokens ja validados durante um curto intervalo."""
+
+    def _decode_jwt_from_config(
+        self, encoded_token: str, csrf_value=None, allow_expired: bool = False
+    ) -> dict:
+        # Apenas o caminho padrao (sem CSRF e sem aceitar tokens expirados) e
+        # cacheado; qualquer token invalido levanta excecao antes de ser armazenado.
+        if csrf_value is not None or allow_expired:
+            return super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+
+        payload = get_cached_token(encoded_token)
+        if payload is not None:
+            return payload
+
+        payload = super()._decode_jwt_from_config(encoded_token, csrf_value, allow_expired)
+        store_cached_token(encoded_token, payload)
+        return payload
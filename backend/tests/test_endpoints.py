@@ -7,21 +7,21 @@ os.environ.setdefault("SECRET_KEY", "test-secret")
 
 
 @pytest.fixture(scope="module")
-def test_client(tmp_path_factory):
-    db_dir = tmp_path_factory.mktemp("db")
-    os.environ["DATABASE_URI"] = f"sqlite:///{db_dir}/test.db"
+def test_client():
+    os.environ["DATABASE_URI"] = "sqlite:///:memory:"
 
     from app import create_app
     from src.models import User
     from src.utils.db import session_scope
 
     app = create_app()
-    client = app.test_client()
 
-    with session_scope() as session:
-        session.add(User(wallet_address="0xtest", is_admin=True))
+    with app.app_context():
+        with session_scope() as session:
+            session.add(User(wallet_address="0xtest", is_admin=True))
 
-    yield app, client
+    with app.test_client() as client:
+        yield app, client
 
 
 def test_healthcheck(test_client):
@@ -57,3 +57,170 @@ def test_create_election_flow(test_client):
     body = response.get_json()
     assert body["election"]["title"] == payload["title"]
     assert len(body["election"]["candidates"]) == 2
+
+
+def test_create_election_deduplicates_candidates(test_client):
+    app, client = test_client
+    with app.app_context():
+        token = create_access_token(identity="0xtest")
+
+    response = client.post(
+        "/api/v1/elections",
+        json={
+            "title": "Municipal",
+            "candidates": ["Eve", "Frank", "Eve"],
+            "txHash": "0xdedupe",
+        },
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 201
+    names = [c["name"] for c in response.get_json()["election"]["candidates"]]
+    assert names == ["Eve", "Frank"]
+
+
+def test_jwt_cache_reuses_valid_tokens(test_client):
+    from src.utils.jwt_cache import clear_token_cache, get_cached_token
+
+    app, client = test_client
+    with app.app_context():
+        token = create_access_token(identity="0xtest")
+
+    clear_token_cache()
+    headers = {"Authorization": f"Bearer {token}"}
+    assert client.get("/api/v1/elections", headers=headers).status_code == 200
+    assert get_cached_token(token)["sub"] == "0xtest"
+
+    response = client.get(
+        "/api/v1/elections", headers={"Authorization": "Bearer invalid"}
+    )
+    assert response.status_code == 401
+    assert get_cached_token("invalid") is None
+
+
+def test_transaction_status_without_blockchain(test_client):
+    app, client = test_client
+    with app.app_context():
+        token = create_access_token(identity="0xtest")
+
+    headers = {"Authorization": f"Bearer {token}"}
+    response = client.get(f"/api/v1/tx/0x{'ab' * 32}", headers=headers)
+    assert response.status_code == 503
+
+    response = client.get("/api/v1/tx/0xabc", headers=headers)
+    assert response.status_code == 400
+
+
+def test_elections_conditional_get(test_client):
+    app, client = test_client
+    with app.app_context():
+        token = create_access_token(identity="0xtest")
+
+    headers = {"Authorization": f"Bearer {token}"}
+    first = client.get("/api/v1/elections", headers=headers)
+    assert first.status_code == 200
+    assert first.headers["ETag"]
+    assert "max-age=5" in first.headers["Cache-Control"]
+
+    second = client.get(
+        "/api/v1/elections",
+        headers={**headers, "If-None-Match": first.headers["ETag"]},
+    )
+    assert second.status_code == 304
+
+
+def test_login_with_signed_nonce(test_client):
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+
+    app, client = test_client
+    account = Account.create()
+    nonce = "abc123"
+    signature = account.sign_message(
+        encode_defunct(text=f"Login nonce: {nonce}")
+    ).signature.hex()
+
+    payload = {"walletAddress": account.address, "signature": signature, "nonce": nonce}
+    for _ in range(2):
+        response = client.post("/api/v1/auth/login", json=payload)
+        assert response.status_code == 200
+        assert response.get_json()["user"]["wallet_address"] == account.address
+
+    response = client.post(
+        "/api/v1/auth/login", json={**payload, "nonce": "other"}
+    )
+    assert response.status_code == 401
+
+
+def test_vote_flow(test_client):
+    app, client = test_client
+    with app.app_context():
+        token = create_access_token(identity="0xvoter")
+    headers = {"Authorization": f"Bearer {token}"}
+
+    election = client.post(
+        "/api/v1/elections",
+        json={"title": "Votacao", "candidates": ["Carol", "Dave"], "txHash": "0x1"},
+        headers=headers,
+    )
+    assert election.status_code == 400  # criador ainda nao autenticado
+
+    with app.app_context():
+        admin_token = create_access_token(identity="0xtest")
+    election = client.post(
+        "/api/v1/elections",
+        json={"title": "Votacao", "candidates": ["Carol", "Dave"], "txHash": "0x1"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    ).get_json()["election"]
+    candidate_id = election["candidates"][0]["id"]
+
+    def vote(election_id, candidate):
+        return client.post(
+            "/api/v1/vote",
+            json={"electionId": election_id, "candidateId": candidate, "txHash": "0xv"},
+            headers=headers,
+        )
+
+    assert vote(9999, candidate_id).status_code == 404
+    assert vote(election["id"], 9999).status_code == 404
+    assert vote(election["id"], candidate_id).status_code == 200
+    assert vote(election["id"], candidate_id).status_code == 409
+
+    results = client.get(
+        f"/api/v1/elections/{election['id']}/results?include_blockchain=false",
+        headers=headers,
+    ).get_json()
+    assert results["source"] == "database"
+    votes = {row["candidate"]: row["votes"] for row in results["results"]}
+    assert votes == {"Carol": 1, "Dave": 0}
+
+
+def test_failed_vote_does_not_cache_new_user_id(test_client, monkeypatch):
+    from sqlalchemy.exc import OperationalError
+
+    from src.services import election_service
+
+    app, client = test_client
+    with app.app_context():
+        admin_token = create_access_token(identity="0xtest")
+        token = create_access_token(identity="0xrollback")
+    election = client.post(
+        "/api/v1/elections",
+        json={"title": "Rollback", "candidates": ["Gina"], "txHash": "0x2"},
+        headers={"Authorization": f"Bearer {admin_token}"},
+    ).get_json()["election"]
+
+    def failing_increment(session, votes):
+        raise OperationalError("UPDATE vote_tallies", {}, Exception("lock wait timeout"))
+
+    payload = {
+        "electionId": election["id"],
+        "candidateId": election["candidates"][0]["id"],
+        "txHash": "0xr",
+    }
+    headers = {"Authorization": f"Bearer {token}"}
+    with monkeypatch.context() as patch:
+        patch.setattr(election_service, "increment_tallies", failing_increment)
+        assert client.post("/api/v1/vote", json=payload, headers=headers).status_code == 500
+    assert election_service._user_ids.get("0xrollback") is None
+
+    assert client.post("/api/v1/vote", json=payload, headers=headers).status_code == 200
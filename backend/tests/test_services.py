@@ -0,0 +1,285 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+os.environ.setdefault("SECRET_KEY", "test-secret")
+
+
+@pytest.fixture(scope="module")
+def database():
+    from src.models import Base
+    from src.utils.db import get_engine, init_engine
+
+    init_engine("sqlite:///:memory:")
+    Base.metadata.create_all(bind=get_engine())
+
+
+def test_vote_buffer_requeues_batch_after_failed_flush(database, monkeypatch):
+    from src.models import Vote
+    from src.services import vote_buffer as vote_buffer_module
+    from src.utils.db import session_scope
+
+    failures = [OperationalError("INSERT INTO votes", {}, Exception("lock wait timeout"))]
+
+    @contextmanager
+    def flaky_session_scope():
+        if failures:
+            raise failures.pop()
+        with session_scope() as session:
+            yield session
+
+    monkeypatch.setattr(vote_buffer_module, "session_scope", flaky_session_scope)
+    # Intervalo longo: o worker em segundo plano nao concorre com os flush() do teste.
+    buffer = vote_buffer_module.VoteBuffer(interval_seconds=3600)
+    assert buffer.enqueue(9001, 9001, 1, "0xbuffered") is not None
+
+    with pytest.raises(OperationalError):
+        buffer.flush()
+    assert buffer.is_pending(9001, 9001)
+    assert buffer.enqueue(9001, 9001, 1, "0xagain") is None
+
+    assert buffer.flush() == 1
+    assert not buffer.is_pending(9001, 9001)
+    with session_scope() as session:
+        stored = session.execute(
+            select(func.count(Vote.id)).where(Vote.election_id == 9001)
+        ).scalar_one()
+    assert stored == 1
+
+
+def test_vote_buffer_keeps_votes_rejected_by_other_constraints(database, monkeypatch):
+    from src.models import Vote
+    from src.services import vote_buffer as vote_buffer_module
+    from src.utils.db import session_scope
+
+    def failing_increment(session, votes):
+        raise IntegrityError("UPDATE vote_tallies", {}, Exception("FOREIGN KEY constraint failed"))
+
+    buffer = vote_buffer_module.VoteBuffer(interval_seconds=3600)
+    assert buffer.enqueue(9002, 9002, 1, "0xkept") is not None
+
+    with monkeypatch.context() as patch:
+        patch.setattr(vote_buffer_module, "increment_tallies", failing_increment)
+        with pytest.raises(IntegrityError):
+            buffer.flush()
+    assert buffer.is_pending(9002, 9002)
+
+    assert buffer.flush() == 1
+    with session_scope() as session:
+        stored = session.execute(
+            select(func.count(Vote.id)).where(Vote.election_id == 9002)
+        ).scalar_one()
+    assert stored == 1
+
+
+def _run_single_flight(loader, followers=4):
+    """Start a leader blocked inside ``loader``, then ``followers`` waiting on it."""
+    from src.services.chain_cache import ChainResultCache
+
+    cache = ChainResultCache()
+    release = threading.Event()
+    results = []
+
+    def blocking_loader():
+        release.wait(timeout=5)
+        return loader()
+
+    def request():
+        try:
+            results.append(cache.get_or_load(1, blocking_loader))
+        except Exception as exc:
+            results.append(exc)
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    while 1 not in cache._inflight:
+        time.sleep(0.005)
+    threads = [threading.Thread(target=request) for _ in range(followers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in [leader, *threads]:
+        thread.join(timeout=5)
+    return cache, results
+
+
+def test_chain_cache_shares_uncacheable_result_with_waiters():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return {"status": "unavailable"}
+
+    cache, results = _run_single_flight(loader)
+    assert len(calls) == 1
+    assert [entry for entry, _ in results] == [{"status": "unavailable"}] * 5
+    assert cache.get(1) is None
+
+
+def test_chain_cache_propagates_leader_error_to_waiters():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        raise RuntimeError("rpc down")
+
+    _, results = _run_single_flight(loader)
+    assert len(calls) == 1
+    assert len(results) == 5
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+class _FakeRpcResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+class _FakeRpcSession:
+    def __init__(self, respond):
+        self.batches = []
+        self._respond = respond
+
+    def post(self, url, json=None, timeout=None):
+        self.batches.append(json)
+        return self._respond(json)
+
+
+def _results_batcher(monkeypatch, respond, eth_call=None):
+    from types import SimpleNamespace
+
+    from src.services import blockchain_service
+
+    rpc_session = _FakeRpcSession(respond)
+    monkeypatch.setattr(blockchain_service, "_rpc_session", rpc_session)
+    web3 = SimpleNamespace(
+        provider=SimpleNamespace(endpoint_uri="http://rpc.test"),
+        eth=SimpleNamespace(call=eth_call),
+    )
+    service = SimpleNamespace(web3=web3, contract=SimpleNamespace(address="0x" + "11" * 20))
+    batcher = blockchain_service.ResultsBatcher(service, window_seconds=0.05)
+    return batcher, rpc_session
+
+
+def test_results_batcher_coalesces_calls_into_one_batch(monkeypatch):
+    def respond(batch):
+        return _FakeRpcResponse(
+            [{"jsonrpc": "2.0", "id": item["id"], "result": hex(item["id"] + 1)} for item in batch]
+        )
+
+    batcher, rpc_session = _results_batcher(monkeypatch, respond)
+    first = batcher.fetch(1, 100)
+    second = batcher.fetch(2, 100)
+    assert batcher.fetch(1, 100) is first
+
+    assert first.result(timeout=2) == b"\x01"
+    assert second.result(timeout=2) == b"\x02"
+    assert len(rpc_session.batches) == 1
+    assert [item["params"][1] for item in rpc_session.batches[0]] == ["0x64", "0x64"]
+
+
+def test_results_batcher_maps_per_item_errors(monkeypatch):
+    def respond(batch):
+        return _FakeRpcResponse(
+            [
+                {"jsonrpc": "2.0", "id": 0, "result": "0x2a"},
+                {"jsonrpc": "2.0", "id": 1, "error": {"code": -32000, "message": "revert"}},
+            ]
+        )
+
+    batcher, _ = _results_batcher(monkeypatch, respond)
+    ok = batcher.fetch(1, 7)
+    failed = batcher.fetch(2, 7)
+
+    assert ok.result(timeout=2) == b"\x2a"
+    with pytest.raises(ValueError, match="revert"):
+        failed.result(timeout=2)
+
+
+def test_results_batcher_falls_back_to_single_calls(monkeypatch):
+    calls = []
+
+    def respond(batch):
+        raise ConnectionError("batch not supported")
+
+    def eth_call(transaction, block_number):
+        calls.append(block_number)
+        if len(calls) == 2:
+            raise RuntimeError("execution reverted")
+        return b"\x05"
+
+    batcher, rpc_session = _results_batcher(monkeypatch, respond, eth_call)
+    ok = batcher.fetch(1, 9)
+    failed = batcher.fetch(2, 9)
+
+    assert ok.result(timeout=2) == b"\x05"
+    with pytest.raises(RuntimeError, match="reverted"):
+        failed.result(timeout=2)
+    assert len(rpc_session.batches) == 1
+    assert calls == [9, 9]
+
+
+def test_chain_cache_reads_local_entries_written_during_redis_outage():
+    from src.services.chain_cache import ChainResultCache
+
+    class FlakyRedis:
+        def __init__(self):
+            self.down = True
+
+        def get(self, key):
+            if self.down:
+                raise ConnectionError("redis down")
+            return None
+
+        def setex(self, key, ttl, value):
+            raise ConnectionError("redis down")
+
+    cache = ChainResultCache()
+    cache._redis = FlakyRedis()
+    entry = {"status": "fresh", "names": ["A"], "counts": [1], "synced_at": "now"}
+    cache.put(1, entry)
+
+    assert cache.get(1) == entry
+    cache._redis.down = False
+    assert cache.get(1) == entry
+
+
+def test_election_watch_deduplicates_and_caps_pending_hashes(monkeypatch):
+    from types import SimpleNamespace
+
+    from web3.exceptions import TransactionNotFound
+
+    from src.services import blockchain_service
+
+    release = threading.Event()
+
+    def get_transaction(tx_hash):
+        release.wait(timeout=5)
+        raise TransactionNotFound(tx_hash)
+
+    service = blockchain_service.BlockchainService.__new__(blockchain_service.BlockchainService)
+    service.web3 = SimpleNamespace(eth=SimpleNamespace(get_transaction=get_transaction))
+    monkeypatch.setattr(blockchain_service, "ELECTION_WATCH_MAX_PENDING", 1)
+
+    first_hash, second_hash = "0x" + "aa" * 32, "0x" + "bb" * 32
+    watch = service.watch_election_creation(first_hash)
+    assert service.watch_election_creation(first_hash) is watch
+    assert service.watch_election_creation(second_hash) is None
+
+    release.set()
+    assert watch.result(timeout=2) is None
+    deadline = time.monotonic() + 2
+    while blockchain_service._election_watches and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert service.watch_election_creation(second_hash).result(timeout=2) is None
@@ -5,40 +5,70 @@ from __future__ import annotations
 
 import argparse
 import json
-import math
 import os
 import random
-import string
+import secrets
+import threading
 import time
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import requests
+import urllib3
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
 from eth_account.messages import encode_defunct
 from web3 import Web3
 from web3.contract import Contract
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson acelera a escrita, mas e opcional
+    orjson = None
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover - numpy acelera o resumo, mas e opcional
+    numpy = None
+
 API_DEFAULT = "http://localhost:5000/api/v1"
 TOKEN_STORAGE_KEY = "athenas-token"
+RETRY_BASE_MS = 250
+RETRY_CAP_MS = 15000
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_WINDOW_SECONDS = 10.0
+BREAKER_RECOVERY_SECONDS = 30.0
+LOGIN_MAX_WORKERS = 64
+DETAIL_BUFFER_BYTES = 1 << 20
+RESPONSE_READ_LIMIT = 8192
+RESPONSE_EXCERPT_CHARS = 400
+GAS_PRICE_TTL_SECONDS = 5.0
+RECEIPT_TIMEOUT_SECONDS = 120
+RECEIPT_WORKERS = 8
 
 load_dotenv()
 
 
-@dataclass
+@dataclass(slots=True)
 class WalletContext:
     address: str
     private_key: str
     token: str
-    session: requests.Session
+    account: LocalAccount
+    nonce: Optional[int] = None
+    headers: Optional[Dict[str, str]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestRecord:
-    timestamp: str
+    offset_ns: int
     request_index: int
     wallet: str
     candidate_id: Optional[int]
@@ -54,20 +84,136 @@ class RequestRecord:
 
 
 def generate_nonce(length: int = 12) -> str:
-    charset = string.ascii_letters + string.digits
-    return "".join(random.choice(charset) for _ in range(length))
+    return secrets.token_urlsafe(length)[:length]
+
+
+def generate_tx_hashes(count: int) -> List[str]:
+    """``count`` random 32-byte hashes drawn from a single ``os.urandom`` call."""
+    buffer = os.urandom(32 * count)
+    return ["0x" + buffer[i : i + 32].hex() for i in range(0, 32 * count, 32)]
+
 
+def percentile(values: Sequence[float], pct: float) -> float:
+    return percentiles(values, [pct])[0]
 
-def percentile(values: List[float], pct: float) -> float:
+
+def percentiles(values: Sequence[float], pcts: List[float]) -> List[float]:
+    """Linear-interpolated percentiles, sorting ``values`` only once for all of them."""
     if not values:
-        return 0.0
+        return [0.0 for _ in pcts]
+    if numpy is not None and isinstance(values, array) and values.typecode == "d":
+        # Le o buffer do array("d") sem copiar; mesmo metodo "linear" do fallback.
+        return [float(v) for v in numpy.percentile(numpy.frombuffer(values), pcts)]
     sorted_values = sorted(values)
-    k = (len(sorted_values) - 1) * (pct / 100)
-    lower = math.floor(k)
-    upper = math.ceil(k)
-    if lower == upper:
-        return sorted_values[int(k)]
-    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+    last = len(sorted_values) - 1
+    results = []
+    for pct in pcts:
+        k = last * (pct / 100)
+        # k nunca e negativo: int() ja trunca para baixo, sem math.floor/ceil.
+        lower = int(k)
+        if k == lower:
+            results.append(sorted_values[lower])
+        else:
+            upper = lower + 1
+            results.append(
+                sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+            )
+    return results
+
+
+def is_transient_status(status_code: int) -> bool:
+    """Only connection failures (status 0), 429 and 5xx are worth retrying."""
+    return status_code == 0 or status_code == 429 or status_code >= 500
+
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with full jitter, in seconds."""
+    return random.uniform(0, min(RETRY_CAP_MS, RETRY_BASE_MS * (2 ** attempt))) / 1000
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    if orjson is not None:
+        # OPT_NON_STR_KEYS mantem a conversao de chaves inteiras feita pelo json padrao.
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=option)
+    if indent:
+        return json.dumps(data, indent=2).encode("utf-8")
+    return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(raw: bytes) -> Any:
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def encode_record(record: RequestRecord) -> bytes:
+    """One JSON Lines entry (compact JSON plus newline)."""
+    if orjson is not None:
+        # orjson serializa dataclasses nativamente, sem passar por asdict().
+        return orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(asdict(record), separators=(",", ":")) + "\n").encode("utf-8")
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of sending a request while the circuit breaker is open."""
+
+
+class BulkheadFullError(requests.RequestException):
+    """Raised when no in-flight slot frees up within the request timeout."""
+
+
+class CircuitBreaker:
+    """CLOSED -> OPEN after too many transient failures, HALF_OPEN probe after recovery."""
+
+    def __init__(
+        self,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        window_seconds: float = BREAKER_WINDOW_SECONDS,
+        recovery_seconds: float = BREAKER_RECOVERY_SECONDS,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.recovery_seconds = recovery_seconds
+        self.state = "closed"
+        self._failures: deque = deque()
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self._opened_at < self.recovery_seconds:
+                    return False
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._probe_in_flight:
+                    return False
+                self._probe_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = "closed"
+            self._failures.clear()
+            self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._probe_in_flight = False
+            if self.state == "half_open":
+                self._open(now)
+                return
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_seconds:
+                self._failures.popleft()
+            if len(self._failures) > self.failure_threshold:
+                self._open(now)
+
+    def _open(self, now: float) -> None:
+        self.state = "open"
+        self._opened_at = now
+        self._failures.clear()
 
 
 class ElectionLoadTester:
@@ -85,6 +231,9 @@ class ElectionLoadTester:
         rpc_url: Optional[str] = None,
         contract_address: Optional[str] = None,
         contract_abi_path: Optional[Path] = None,
+        concurrency: int = 1,
+        max_in_flight: int = 32,
+        record_bodies: bool = False,
     ) -> None:
         if seed is not None:
             random.seed(seed)
@@ -94,6 +243,7 @@ class ElectionLoadTester:
         self.candidate_names = candidate_names
         self.timeout = timeout
         self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
         self.output_dir = output_dir
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.wallet_file = wallet_file
@@ -105,23 +255,54 @@ class ElectionLoadTester:
 
         self.wallets: List[WalletContext] = []
         self.election: Optional[Dict[str, Any]] = None
-        self.records: List[RequestRecord] = []
         self.request_counter = 0
-        self.session = requests.Session()
-        self.successful_wallets: Dict[str, bool] = {}
+        self._records_lock = threading.Lock()
+        # Os registros vao direto para o arquivo JSON Lines; em memoria ficam
+        # apenas os agregados usados no resumo.
+        self.latencies = array("d")
+        self.success_count = 0
+        self.error_breakdown: Dict[str, Dict[str, Any]] = {}
+        self.run_timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        # Cada registro guarda apenas o deslocamento (ns) desde este instante;
+        # o horario absoluto e started_at + offset_ns.
+        self.started_at = datetime.now(timezone.utc)
+        self._started_ns = time.monotonic_ns()
+        self.detail_path = self.output_dir / f"load_test_results_{self.run_timestamp}.jsonl"
+        self._detail_file = None
+        self.breaker = CircuitBreaker()
+        self.max_in_flight = max(1, max_in_flight)
+        self.record_bodies = record_bodies
+        self._bulkhead = threading.BoundedSemaphore(self.max_in_flight)
+        self.session = self._build_session()
+        # Carteiras ainda sem voto aceito na eleicao atual, mantidas a cada
+        # sucesso para nao varrer todas as carteiras a cada rodada.
+        self._unused_wallets: Dict[str, WalletContext] = {}
+        self._unused_lock = threading.Lock()
         self.web3: Optional[Web3] = None
         self.contract: Optional[Contract] = None
         self.chain_election_id: Optional[int] = None
         self.elections_created = 0
+        self._vote_body_prefix = b""
+        self._candidate_index: Dict[int, int] = {}
+        self._gas_price_lock = threading.Lock()
+        self._gas_price_value: Optional[int] = None
+        self._gas_price_at = 0.0
+        self._receipt_executor = ThreadPoolExecutor(max_workers=RECEIPT_WORKERS)
+        self._pending_receipts: List[Any] = []
+        self.onchain_failures = 0
 
         if self.use_blockchain:
             self._init_blockchain()
 
     def run(self) -> None:
-        self._prepare_wallets()
-        self._authenticate_wallets()
-        self._create_election()
-        self._execute_votes()
+        with self.detail_path.open("wb", buffering=DETAIL_BUFFER_BYTES) as detail_file:
+            self._detail_file = detail_file
+            self._prepare_wallets()
+            self._authenticate_wallets()
+            self._create_election()
+            self._execute_votes()
+        self._detail_file = None
+        self._drain_receipts()
         self._write_reports()
 
     # ---------- Setup ----------
@@ -141,10 +322,9 @@ class ElectionLoadTester:
                     address=address,
                     private_key=private_key,
                     token="",
-                    session=requests.Session(),
+                    account=Account.from_key(private_key),
                 )
                 self.wallets.append(context)
-                self.successful_wallets[context.address] = False
         else:
             for _ in range(self.requested_wallets):
                 account = Account.create()
@@ -152,22 +332,40 @@ class ElectionLoadTester:
                     address=account.address,
                     private_key=account.key.hex(),
                     token="",
-                    session=requests.Session(),
+                    account=account,
                 )
                 self.wallets.append(context)
-                self.successful_wallets[context.address] = False
 
         if not self.wallets:
             raise RuntimeError("At least one wallet is required to execute the test.")
 
+    def _build_session(self) -> requests.Session:
+        # Uma unica sessao compartilhada por todas as carteiras: o JWT vai no
+        # cabecalho de cada requisicao e as conexoes keep-alive sao reaproveitadas.
+        # O bulkhead limita as requisicoes simultaneas, entao o pool segue o mesmo limite.
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.max_in_flight, max_retries=0
+        )
+        session = requests.Session()
+        session.headers["Content-Type"] = "application/json"
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _authenticate_wallets(self) -> None:
-        for wallet in self.wallets:
-            wallet.token = self._login_wallet(wallet)
+        # Logins sao independentes entre si e nao fazem parte das metricas de
+        # voto, entao nao ficam limitados por --concurrency (o bulkhead ainda vale).
+        workers = min(LOGIN_MAX_WORKERS, len(self.wallets))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            tokens = list(executor.map(self._login_wallet, self.wallets))
+        for wallet, token in zip(self.wallets, tokens):
+            wallet.token = token
+            wallet.headers = {"Authorization": f"Bearer {token}"}
 
     def _login_wallet(self, wallet: WalletContext) -> str:
         nonce = generate_nonce()
         message = encode_defunct(text=f"Login nonce: {nonce}")
-        signature = Account.sign_message(message, private_key=wallet.private_key).signature.hex()
+        signature = wallet.account.sign_message(message).signature.hex()
         payload = {
             "walletAddress": wallet.address,
             "signature": signature,
@@ -175,7 +373,7 @@ class ElectionLoadTester:
         }
         response = self._post("/auth/login", payload, wallet)
         response.raise_for_status()
-        return response.json()["access_token"]
+        return loads_json(response.content)["access_token"]
 
     def _create_election(self) -> None:
         admin_wallet = self.wallets[0]
@@ -195,7 +393,11 @@ class ElectionLoadTester:
 
         response = self._post("/elections", payload, admin_wallet)
         response.raise_for_status()
-        self.election = response.json()["election"]
+        self.election = loads_json(response.content)["election"]
+        self._vote_body_prefix = b'{"electionId":%d,"candidateId":' % self.election["id"]
+        self._candidate_index = {
+            entry["id"]: idx for idx, entry in enumerate(self.election.get("candidates", []))
+        }
         self.elections_created += 1
         self._reset_wallet_usage()
 
@@ -209,26 +411,36 @@ class ElectionLoadTester:
         if not candidates:
             raise RuntimeError("Election returned without candidates; cannot proceed.")
 
-        for index in range(self.total_votes):
-            if all(self.successful_wallets.values()):
-                self._create_election()
-                candidates = self.election.get("candidates", [])
-            wallet = self._select_wallet()
-            candidate = random.choice(candidates)
-            self._submit_vote(wallet, candidate, index)
-
-    def _select_wallet(self) -> WalletContext:
-        unused = [w for w in self.wallets if not self.successful_wallets[w.address]]
-        pool = unused or self.wallets
-        return random.choice(pool)
-
-    def _submit_vote(self, wallet: WalletContext, candidate: Dict[str, Any], vote_index: int) -> None:
-        tx_hash = None
-        candidate_index = None
-        for idx, entry in enumerate(self.election.get("candidates", [])):
-            if entry["id"] == candidate["id"]:
-                candidate_index = idx
-                break
+        # Cada rodada usa carteiras distintas, entao os votos dela podem ser
+        # enviados em paralelo sem duas requisicoes da mesma carteira.
+        index = 0
+        if self.use_blockchain and self.contract:
+            tx_hashes: List[Optional[str]] = [None] * self.total_votes
+        else:
+            tx_hashes = generate_tx_hashes(self.total_votes)
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            while index < self.total_votes:
+                if not self._unused_wallets:
+                    self._create_election()
+                    candidates = self.election.get("candidates", [])
+                with self._unused_lock:
+                    unused = list(self._unused_wallets.values())
+                batch = random.sample(unused, min(len(unused), self.total_votes - index))
+                tasks = [
+                    (wallet, random.choice(candidates), index + offset, tx_hashes[index + offset])
+                    for offset, wallet in enumerate(batch)
+                ]
+                list(executor.map(lambda task: self._submit_vote(*task), tasks))
+                index += len(batch)
+
+    def _submit_vote(
+        self,
+        wallet: WalletContext,
+        candidate: Dict[str, Any],
+        vote_index: int,
+        tx_hash: Optional[str] = None,
+    ) -> None:
+        candidate_index = self._candidate_index.get(candidate["id"])
 
         if self.use_blockchain and self.contract:
             if candidate_index is None:
@@ -259,7 +471,7 @@ class ElectionLoadTester:
                     attempt=0,
                 )
                 return
-        else:
+        elif tx_hash is None:
             tx_hash = self._generate_tx_hash()
 
         payload = {
@@ -267,6 +479,12 @@ class ElectionLoadTester:
             "candidateId": candidate["id"],
             "txHash": tx_hash,
         }
+        # Corpo montado a partir do prefixo fixo da eleicao, sem passar pelo
+        # serializador JSON do requests a cada tentativa.
+        body = self._vote_body_prefix + b'%d,"txHash":"%s"}' % (
+            candidate["id"],
+            tx_hash.encode("ascii"),
+        )
 
         max_attempts = self.max_retries + 1
         for attempt in range(1, max_attempts + 1):
@@ -276,12 +494,21 @@ class ElectionLoadTester:
             response_excerpt = ""
             operation_status = "error"
             try:
-                response = self._post("/vote", payload, wallet)
+                response = self._post("/vote", None, wallet, body=body, stream=True)
                 status_code = response.status_code
-                body = self._safe_json(response)
-                message = body.get("message") or body.get("status") or ""
-                response_excerpt = self._truncate_json(body)
-                operation_status = "success" if status_code < 400 and body.get("status") == "ok" else "error"
+                if self.record_bodies or status_code >= 400:
+                    # Erros podem trazer paginas HTML/stack traces: le no maximo
+                    # RESPONSE_READ_LIMIT bytes em vez do corpo inteiro.
+                    raw = self._read_bounded(response)
+                    data = self._parse_body(raw)
+                    message = data.get("message") or data.get("status") or ""
+                    response_excerpt = raw[:RESPONSE_EXCERPT_CHARS].decode("utf-8", "replace")
+                    operation_status = "success" if status_code < 400 and data.get("status") == "ok" else "error"
+                else:
+                    # Sem --record-bodies, respostas de sucesso nao sao decodificadas;
+                    # o corpo (pequeno) so e consumido para a conexao voltar ao pool.
+                    _ = response.content
+                    operation_status = "success"
             except requests.RequestException as exc:
                 message = str(exc)
                 status_code = getattr(exc.response, "status_code", 0)
@@ -300,36 +527,77 @@ class ElectionLoadTester:
                 )
 
             if operation_status == "success":
-                self.successful_wallets[wallet.address] = True
+                with self._unused_lock:
+                    self._unused_wallets.pop(wallet.address, None)
+                break
+            if not is_transient_status(status_code):
                 break
             if attempt < max_attempts:
-                time.sleep(0.2 * attempt)
+                time.sleep(backoff_delay(attempt))
 
     # ---------- Networking & logging ----------
 
-    def _post(self, path: str, payload: Dict[str, Any], wallet: Optional[WalletContext] = None) -> requests.Response:
+    def _post(
+        self,
+        path: str,
+        payload: Optional[Dict[str, Any]],
+        wallet: Optional[WalletContext] = None,
+        body: Optional[bytes] = None,
+        stream: bool = False,
+    ) -> requests.Response:
+        """POST ``payload`` as JSON, or ``body`` verbatim when it is already encoded."""
         url = f"{self.base_url}{path}"
-        headers = {}
-        if wallet and wallet.token:
-            headers["Authorization"] = f"Bearer {wallet.token}"
-        return (wallet.session if wallet else self.session).post(
-            url,
-            json=payload,
-            headers=headers,
-            timeout=self.timeout,
-        )
+        if body is None:
+            body = dumps_json(payload)
+        # Content-Type fica na sessao e o cabecalho Authorization e montado uma
+        # vez por carteira no login.
+        headers = wallet.headers if wallet is not None else None
+        # Fila cheia no cliente nao e falha do servidor: nao conta para o breaker,
+        # mas volta como erro transitorio para o backoff do chamador. O bulkhead
+        # vem antes do breaker para que a sonda liberada em HALF_OPEN sempre
+        # termine em record_success/record_failure.
+        if not self._bulkhead.acquire(timeout=self.timeout):
+            raise BulkheadFullError(f"More than {self.max_in_flight} requests in flight")
+        try:
+            if not self.breaker.allow():
+                raise CircuitOpenError("Circuit breaker open: requests suspended after repeated failures")
+            try:
+                response = self.session.post(
+                    url,
+                    data=body,
+                    headers=headers,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+            except Exception:
+                self.breaker.record_failure()
+                raise
+        finally:
+            self._bulkhead.release()
+        if is_transient_status(response.status_code):
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return response
 
     @staticmethod
-    def _safe_json(response: requests.Response) -> Dict[str, Any]:
+    def _read_bounded(response: requests.Response) -> bytes:
         try:
-            return response.json()
-        except ValueError:
-            return {"raw": response.text}
+            return response.raw.read(RESPONSE_READ_LIMIT, decode_content=True) or b""
+        except urllib3.exceptions.HTTPError as exc:
+            # response.raw e o urllib3 direto: timeout ou conexao perdida no meio
+            # do corpo vira ConnectionError (status 0), tratado como falha transitoria.
+            raise requests.ConnectionError(exc) from exc
+        finally:
+            response.close()
 
     @staticmethod
-    def _truncate_json(data: Dict[str, Any], limit: int = 400) -> str:
-        serialized = json.dumps(data, ensure_ascii=True)
-        return serialized[:limit]
+    def _parse_body(raw: bytes) -> Dict[str, Any]:
+        try:
+            data = loads_json(raw)
+        except ValueError:
+            return {}
+        return data if isinstance(data, dict) else {}
 
     def _record_request(
         self,
@@ -343,10 +611,12 @@ class ElectionLoadTester:
         response_excerpt: str,
         attempt: int,
     ) -> None:
-        self.request_counter += 1
+        with self._records_lock:
+            self.request_counter += 1
+            request_index = self.request_counter
         record = RequestRecord(
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            request_index=self.request_counter,
+            offset_ns=time.monotonic_ns() - self._started_ns,
+            request_index=request_index,
             wallet=wallet,
             candidate_id=candidate.get("id"),
             candidate_name=candidate.get("name"),
@@ -359,14 +629,27 @@ class ElectionLoadTester:
             response_excerpt=response_excerpt,
             attempt=attempt,
         )
-        self.records.append(record)
+        line = encode_record(record)
+        with self._records_lock:
+            self.latencies.append(record.response_time_ms)
+            if operation_status == "success":
+                self.success_count += 1
+            else:
+                error_entry = self.error_breakdown.setdefault(
+                    str(status_code), {"count": 0, "messages": {}}
+                )
+                error_entry["count"] += 1
+                msg_key = message or "(sem mensagem)"
+                error_entry["messages"][msg_key] = error_entry["messages"].get(msg_key, 0) + 1
+            if self._detail_file is not None:
+                self._detail_file.write(line)
 
     def _reset_wallet_usage(self) -> None:
-        for key in self.successful_wallets:
-            self.successful_wallets[key] = False
+        with self._unused_lock:
+            self._unused_wallets = {wallet.address: wallet for wallet in self.wallets}
 
     def _generate_tx_hash(self) -> str:
-        return f"0x{random.getrandbits(256):064x}"
+        return generate_tx_hashes(1)[0]
 
     # ---------- Blockchain helpers ----------
 
@@ -401,55 +684,80 @@ class ElectionLoadTester:
             election_count = self.contract.functions.electionCount().call()
             self.chain_election_id = max(0, election_count - 1)
         tx_function = self.contract.functions.vote(self.chain_election_id, candidate_index)
-        tx_hash, _ = self._send_contract_tx(wallet, tx_function)
+        # A API so precisa do hash: o recibo e aguardado em segundo plano.
+        tx_hash, _ = self._send_contract_tx(wallet, tx_function, wait_for_receipt=False)
+        self._pending_receipts.append(self._receipt_executor.submit(self._await_receipt, tx_hash))
         return tx_hash
 
-    def _send_contract_tx(self, wallet: WalletContext, tx_function) -> Tuple[str, Any]:
+    def _send_contract_tx(
+        self, wallet: WalletContext, tx_function, wait_for_receipt: bool = True
+    ) -> Tuple[str, Any]:
         if not self.web3:
             raise RuntimeError("Web3 provider not initialized")
-        account = self.web3.eth.account.from_key(wallet.private_key)
-        nonce = self.web3.eth.get_transaction_count(account.address, 'pending')
+        account = wallet.account
+        # Cada carteira envia uma transacao por vez (uma por rodada), entao o
+        # nonce local basta; ele so e relido da rede apos uma falha de envio.
+        if wallet.nonce is None:
+            wallet.nonce = self.web3.eth.get_transaction_count(account.address, "pending")
         transaction = tx_function.build_transaction(
             {
                 "from": account.address,
-                "nonce": nonce,
-                "gasPrice": self.web3.eth.gas_price,
+                "nonce": wallet.nonce,
+                "gasPrice": self._gas_price(),
             }
         )
         transaction.setdefault("gas", 500000)
-        signed_tx = self.web3.eth.account.sign_transaction(transaction, wallet.private_key)
+        signed_tx = account.sign_transaction(transaction)
         raw_tx = getattr(signed_tx, "rawTransaction", signed_tx.raw_transaction)
-        tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
-        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+        try:
+            tx_hash = self.web3.eth.send_raw_transaction(raw_tx)
+        except Exception:
+            wallet.nonce = None
+            raise
+        wallet.nonce += 1
+        receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash) if wait_for_receipt else None
         return self.web3.to_hex(tx_hash), receipt
 
+    def _gas_price(self) -> int:
+        with self._gas_price_lock:
+            now = time.monotonic()
+            if self._gas_price_value is None or now - self._gas_price_at > GAS_PRICE_TTL_SECONDS:
+                self._gas_price_value = self.web3.eth.gas_price
+                self._gas_price_at = now
+            return self._gas_price_value
+
+    def _await_receipt(self, tx_hash: str) -> bool:
+        try:
+            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT_SECONDS)
+            return receipt.status == 1
+        except Exception:
+            return False
+
+    def _drain_receipts(self) -> None:
+        failed = sum(1 for future in self._pending_receipts if not future.result())
+        self.onchain_failures = failed
+        self._receipt_executor.shutdown(wait=True)
+
     # ---------- Reporting ----------
 
     def _write_reports(self) -> None:
-        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-        detail_path = self.output_dir / f"load_test_results_{timestamp}.json"
-        summary_path = self.output_dir / f"load_test_summary_{timestamp}.json"
+        summary_path = self.output_dir / f"load_test_summary_{self.run_timestamp}.json"
 
-        detail_payload = {
+        summary_payload = {
             "generated_at": datetime.utcnow().isoformat(),
+            "started_at": self.started_at.isoformat(),
             "config": self._config_dict(),
             "election": {
                 "id": self.election.get("id") if self.election else None,
                 "title": self.election.get("title") if self.election else None,
                 "candidates": self.election.get("candidates") if self.election else [],
             },
-            "records": [asdict(record) for record in self.records],
-        }
-        detail_path.write_text(json.dumps(detail_payload, indent=2), encoding="utf-8")
-
-        summary_payload = {
-            "generated_at": datetime.utcnow().isoformat(),
-            "config": self._config_dict(),
+            "records_file": self.detail_path.name,
             "stats": self._summarize_records(),
         }
-        summary_path.write_text(json.dumps(summary_payload, indent=2), encoding="utf-8")
+        summary_path.write_bytes(dumps_json(summary_payload, indent=True))
 
-        print(f"Detalhes salvos em: {detail_path}")
+        print(f"Detalhes salvos em: {self.detail_path}")
         print(f"Resumo salvo em:   {summary_path}")
 
     def _config_dict(self) -> Dict[str, Any]:
@@ -460,25 +768,20 @@ class ElectionLoadTester:
             "candidate_names": self.candidate_names,
             "timeout": self.timeout,
             "max_retries": self.max_retries,
+            "concurrency": self.concurrency,
+            "max_in_flight": self.max_in_flight,
+            "record_bodies": self.record_bodies,
             "blockchain": bool(self.contract),
             "elections_created": self.elections_created,
         }
 
     def _summarize_records(self) -> Dict[str, Any]:
-        total = len(self.records)
-        successes = sum(1 for record in self.records if record.operation_status == "success")
+        latencies = self.latencies
+        total = len(latencies)
+        successes = self.success_count
         failures = total - successes
-        latencies = [record.response_time_ms for record in self.records]
-
-        error_breakdown: Dict[str, Dict[str, Any]] = {}
-        for record in self.records:
-            if record.operation_status == "success":
-                continue
-            code_key = str(record.status_code)
-            error_entry = error_breakdown.setdefault(code_key, {"count": 0, "messages": {}})
-            error_entry["count"] += 1
-            msg_key = record.message or "(sem mensagem)"
-            error_entry["messages"][msg_key] = error_entry["messages"].get(msg_key, 0) + 1
+
+        p50, p95, p99 = percentiles(latencies, [50, 95, 99])
 
         return {
             "total_requests": total,
@@ -488,13 +791,14 @@ class ElectionLoadTester:
             "failure_rate": round((failures / total) * 100, 2) if total else 0.0,
             "latency_ms": {
                 "avg": round(sum(latencies) / total, 2) if total else 0.0,
-                "p50": round(percentile(latencies, 50), 2),
-                "p95": round(percentile(latencies, 95), 2),
-                "p99": round(percentile(latencies, 99), 2),
+                "p50": round(p50, 2),
+                "p95": round(p95, 2),
+                "p99": round(p99, 2),
                 "min": round(min(latencies), 2) if latencies else 0.0,
                 "max": round(max(latencies), 2) if latencies else 0.0,
             },
-            "error_types": error_breakdown,
+            "error_types": self.error_breakdown,
+            "onchain_failures": self.onchain_failures,
         }
 
 
@@ -506,6 +810,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--candidates", nargs="+", default=["Alice", "Bob", "Carol"])
     parser.add_argument("--timeout", type=float, default=10.0)
     parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Quantidade de votos enviados em paralelo",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        "--max-inflight",
+        type=int,
+        default=32,
+        help="Limite de requisicoes HTTP simultaneas (bulkhead)",
+    )
+    parser.add_argument(
+        "--record-bodies",
+        action="store_true",
+        help="Decodifica e registra o corpo tambem das respostas de sucesso",
+    )
     parser.add_argument("--output-dir", type=Path, default=Path("backend/tests/results"))
     parser.add_argument("--seed", type=int, default=None)
     parser.add_argument("--wallet-file", type=Path, default=None)
@@ -535,6 +857,9 @@ def main() -> None:
         rpc_url=args.rpc_url,
         contract_address=args.contract_address,
         contract_abi_path=args.contract_abi,
+        concurrency=args.concurrency,
+        max_in_flight=args.max_in_flight,
+        record_bodies=args.record_bodies,
     )
     tester.run()
 